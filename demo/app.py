@@ -1,15 +1,132 @@
-import contextlib
+import ast
+import json
+import time
 
-import pandas as pd
+import httpx
 import streamlit as st
 from st_social_media_links import SocialMediaIcons
+from storage3.utils import StorageException
 from streamlit.components.v1 import html as st_html
 
-from st_supabase_connection import execute_query  # noqa: F401
-from st_supabase_connection import SupabaseConnection, __version__
+from st_supabase_connection import SupabaseConnection, __version__, execute_query
 
 VERSION = __version__
 
+EXPLORE_VIEWS = ("Explore storage 📦", "Explore database 🗄️", "Explore auth 🔐")
+
+# Operation labels shown in the selectboxes, mapped to the connection methods they run
+OPERATION_QUERY_DICT = {
+    "Create a bucket": "create_bucket",
+    "Update bucket": "update_bucket",
+    "Delete a bucket": "delete_bucket",
+    "Empty a bucket": "empty_bucket",
+    "Upload a file": "upload",
+    "Move an existing file": "move",
+    "Delete files in a bucket": "remove",
+    "Create a signed upload URL": "create_signed_upload_url",
+    "Upload to signed URL": "upload_to_signed_url",
+    "Retrieve a bucket": "get_bucket",
+    "List all buckets": "list_buckets",
+    "Download a file": "download",
+    "List all files in a bucket": "list_objects",
+    "Create signed URLs": "create_signed_urls",
+    "Retrieve public URL": "get_public_url",
+}
+STORAGE_OPERATIONS = tuple(OPERATION_QUERY_DICT)
+
+# Storage operations that can't be run against the demo project
+RESTRICTED_STORAGE_OPERATORS = frozenset(
+    {
+        "create_bucket",
+        "update_bucket",
+        "delete_bucket",
+        "empty_bucket",
+        "upload",
+        "move",
+        "remove",
+        "create_signed_upload_url",
+        "upload_to_signed_url",
+    }
+)
+
+AUTH_OPERATION_QUERY_DICT = {
+    "Create a new user": "sign_up",
+    "Sign in with password": "sign_in_with_password",
+    "Sign in with OTP": "sign_in_with_otp",
+    "Retrieve session": "get_session",
+    "Retrieve user": "get_user",
+    "Sign out": "sign_out",
+}
+AUTH_OPERATIONS = tuple(AUTH_OPERATION_QUERY_DICT)
+_NO_ARG_AUTH_OPERATORS = frozenset({"get_session", "get_user", "sign_out"})
+
+# Contents of the demo project, shown as markdown tables
+DEMO_STORAGE_SCHEMA = """
+bucket | object
+|---|---
+`bucket1`| `/awesome_zoom_background.jpg`
+`bucket2`| `/folder1/folder2/lenna.png`
+"""
+
+DEMO_DATABASE_SCHEMA = """
+| Table | Columns | Size
+|---|---|---
+|`cities`| `id`, `country_id`, `name` | 2
+|`countries`| `id`, `name`, `iso2`, `iso3`, `local_name`, `continent` | 249
+|`messages`| `sender_id`, `receiver_id`, `content` | 2
+|`teams`| `id`, `name` | 2
+|`users`| `id`, `name` | 2
+|`users_teams`| `user_id`, `team_id` | 3
+"""
+
+# Operations whose inputs are re-rendered as soon as another input changes. Besides the ones whose
+# widgets depend on another input, this covers those that delete or move data, so their code can
+# be reviewed before anything runs
+LIVE_STORAGE_OPERATIONS = frozenset(
+    {"upload", "upload_to_signed_url", "delete_bucket", "empty_bucket", "move", "remove"}
+)
+
+# Seconds to reuse fetched bucket properties while they are being edited
+BUCKET_PROPS_TTL = 30
+
+# Rows of a listing sent to the browser, the rest is available as a CSV download
+MAX_DISPLAYED_OBJECTS = 500
+
+# Friendlier messages for expected failures, any other error is shown as-is
+_ERROR_MESSAGES = {
+    httpx.ConnectError: "Could not connect. Please check the Supabase URL provided",
+}
+
+# Query types that modify data, and of those the ones that take rows instead of filters
+_MUTATING = frozenset({"insert", "upsert", "update", "delete"})
+_WRITES_ROWS = frozenset({"insert", "upsert", "update"})
+
+# Query types that can't be run against the demo project, with the tooltip explaining why
+_DEMO_DISABLED = {
+    request_builder: f"{request_builder.upper()} not allowed in demo project"
+    for request_builder in _MUTATING
+}
+
+# Help texts of the database query widgets
+SELECT_TTL_HELP = (
+    "Set as `0` to always fetch the latest results, or leave blank to cache indefinitely."
+)
+DML_TTL_HELP = (
+    "Set as `0` to always fetch the latest results (recommended for DML), "
+    "or leave blank to cache indefinitely."
+)
+REQUEST_BUILDER_HELP = (
+    "[RequestBuilder API reference]"
+    "(https://postgrest-py.readthedocs.io/en/latest/api/request_builders.html#postgrest.AsyncRequestBuilder)"
+)
+DEFAULT_OPERATORS = """.eq("continent","Asia").order("name",desc=True).limit(5)"""
+OPERATORS_HELP = (
+    "List of all available [operators]"
+    "(https://postgrest-py.readthedocs.io/en/latest/api/request_builders.html#postgrest.AsyncSelectRequestBuilder) "
+    "and [filters](https://postgrest-py.readthedocs.io/en/latest/api/filters.html#postgrest.AsyncFilterRequestBuilder).  \n"
+    "Use `.range(start, end)` to page through large tables instead of fetching every row at once."
+)
+
 st.set_page_config(
     page_title="st_supabase_connection",
     page_icon="🔌",
@@ -22,26 +139,699 @@ st.set_page_config(
 )
 
 # ---------- INIT SESSION ----------
-upsert = operators = bucket_id = file_size_limit = allowed_mime_types = source = None
-public = False
+upsert = None
+
+for state_key, default in {
+    "client": None,
+    "project": "demo",
+    "initialized": False,
+    "storage_disabled": True,
+}.items():
+    st.session_state.setdefault(state_key, default)
 
-if "client" not in st.session_state:
-    st.session_state["client"] = None
-else:
+if st.session_state["client"] is not None:
     st_supabase = st.session_state["client"]
 
-if "project" not in st.session_state:
-    st.session_state["project"] = "demo"
 
-if "initialized" not in st.session_state:
-    st.session_state["initialized"] = False
+@st.cache_data(ttl=None, show_spinner=False)
+def _load_sidebar_html(version: str) -> str:
+    with open("demo/sidebar.html", "r", encoding="UTF-8") as sidebar_file:
+        return sidebar_file.read().replace("{VERSION}", version)
+
+
+def _get_connection(ttl=None, **credentials) -> SupabaseConnection:
+    # `st.connection` is backed by `st.cache_resource`, so every session asking for the same
+    # project and ttl shares one client instead of setting up a new one per rerun
+    return st.connection(
+        name="supabase_connection", type=SupabaseConnection, ttl=ttl, **credentials
+    )
+
+
+# ---------- STORAGE HANDLERS ----------
+_INVALID = object()
+
+
+def _describe_uploaded_file(file):
+    # Only the name is shown, the object's repr would spell out all its upload metadata
+    return f"<UploadedFile: {file.name}>" if file else "None"
+
+
+def _parse_list(value, label):
+    """Parses a list entered in a text input, e.g. `['a.png','b.txt']`, without evaluating code"""
+    if not value:
+        return None
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        parsed = _INVALID
+    if parsed is None or isinstance(parsed, (list, tuple)):
+        return parsed
+    st.error(f"{label} must be entered as a list", icon="❌")
+    return _INVALID
+
+
+def _ttl_input(container=st):
+    """Renders the results cache duration input shared by the cached storage operations"""
+    ttl = container.text_input(
+        "Results cache duration",
+        value="",
+        placeholder="Optional",
+        help="Leave blank to cache indefinitely",
+    )
+    return None if ttl == "" else ttl
+
+
+# Each handler renders the inputs of one storage operation, flags whether the query can be run,
+# and returns the constructed query along with the arguments to run it with.
+def _render_get_bucket(bucket_id):
+    ttl = _ttl_input()
+    st.session_state["storage_disabled"] = bool(not bucket_id)
+    return f"""st_supabase.get_bucket("{bucket_id}", {ttl=})""", (bucket_id,), dict(ttl=ttl)
+
+
+def _render_delete_bucket(bucket_id):
+    st.session_state["storage_disabled"] = bool(not bucket_id)
+    return f"""st_supabase.delete_bucket("{bucket_id}")""", (bucket_id,), {}
+
+
+def _render_empty_bucket(bucket_id):
+    st.session_state["storage_disabled"] = bool(not bucket_id)
+    return f"""st_supabase.empty_bucket("{bucket_id}")""", (bucket_id,), {}
+
+
+def _render_create_bucket(bucket_id):
+    col1, col2, col3, col4 = st.columns(4)
+
+    name = col1.text_input(
+        "Bucket name",
+        placeholder=bucket_id,
+        help="The name of the bucket. Defaults to bucket id",
+    )
+
+    file_size_limit = col2.number_input(
+        "Bucket file size limit",
+        min_value=0,
+        value=0,
+        help="Size limit of the files that can be uploaded to the bucket (in bytes). `0` means no limit.",
+    )
+    file_size_limit = None if file_size_limit == 0 else file_size_limit
+
+    allowed_mime_types = col3.text_area(
+        "Allowed MIME types",
+        placeholder="['text/plain','image/jpg']",
+        help="The MIME types that can be uploaded to the bucket. Enter as a list. Defaults to `None` to allow all file types.",
+    )
+    allowed_mime_types = None if len(allowed_mime_types) == 0 else allowed_mime_types
+    mime_types = _parse_list(allowed_mime_types, "Allowed MIME types")
+
+    public = col4.checkbox(
+        "Public",
+        help="Whether the bucket should be publicly accessible?",
+        value=False,
+    )
+
+    st.session_state["storage_disabled"] = bool(not bucket_id) or mime_types is _INVALID
+    return (
+        f"""st_supabase.create_bucket('{bucket_id}',{name=},{file_size_limit=},allowed_mime_types={allowed_mime_types},{public=})""",
+        (bucket_id,),
+        dict(
+            name=name,
+            file_size_limit=file_size_limit,
+            allowed_mime_types=mime_types,
+            public=public,
+        ),
+    )
+
+
+@st.cache_resource(ttl=BUCKET_PROPS_TTL, show_spinner=False, hash_funcs={SupabaseConnection: id})
+def _get_bucket_props(connection, bucket_id):
+    """Short-lived cache of the properties being edited, cached here instead of through
+    `st_supabase.get_bucket()` so the entry can be dropped as soon as the bucket changes.
+    Keyed on the connection, so projects or keys sharing a URL never share properties."""
+    return connection.client.storage.get_bucket(bucket_id)
+
+
+def _render_update_bucket(bucket_id):
+    file_size_limit = allowed_mime_types = mime_types = None
+    public = False
+    if bucket_id:
+        try:
+            current_props = _get_bucket_props(st_supabase, bucket_id)
+            st.info("Current properties fetched. Update values to update properties.")
+            col1, col2, col3 = st.columns(3)
+
+            file_size_limit = col1.number_input(
+                "New file size limit",
+                min_value=0,
+                value=current_props.file_size_limit or 0,
+                help="Set as `0` to have no limit",
+            )
+            file_size_limit = None if file_size_limit == 0 else file_size_limit
+
+            allowed_mime_types = col2.text_area(
+                "New allowed MIME types",
+                value=current_props.allowed_mime_types or "",
+                help="Enter as a list. Set `None` to allow all MIME types.",
+            )
+            mime_types = _parse_list(allowed_mime_types, "New allowed MIME types")
+
+            public = col3.checkbox(
+                "Public",
+                help="Whether the bucket should be publicly accessible?",
+                value=current_props.public,
+            )
+            st.session_state["storage_disabled"] = mime_types is _INVALID
+        except StorageException:
+            st.error(f"Bucket with id **{bucket_id}** not found", icon="❌")
+            st.session_state["storage_disabled"] = True
+        except Exception as e:
+            st.write(e)
+            st.session_state["storage_disabled"] = True
+
+    return (
+        f"""st_supabase.update_bucket('{bucket_id}',{file_size_limit=},allowed_mime_types={allowed_mime_types},{public=})""",
+        (bucket_id,),
+        dict(file_size_limit=file_size_limit, allowed_mime_types=mime_types, public=public),
+    )
+
+
+def _render_upload(bucket_id):
+    destination_path = None
+    lcol, rcol = st.columns([1, 3])
+    source = lcol.selectbox(
+        label="Source filesystem",
+        options=["local", "hosted"],
+        help="Filesystem from where the file has to be uploaded",
+    )
+
+    if source == "local":
+        file = rcol.file_uploader("Choose a file")
+        lcol, rcol = st.columns([3, 1])
+
+        destination_path = lcol.text_input(
+            "Destination path in the bucket",
+            value=file.name if file else "",
+        )
+        overwrite = "true" if rcol.checkbox("Overwrite if exists?") else "false"
+
+        constructed_storage_query = f"""
+        st_supabase.upload("{bucket_id}", {source=}, file={_describe_uploaded_file(file)}, destination_path="{destination_path}", {overwrite=})
+        # `UploadedFile` is the `BytesIO` object returned by `st.file_uploader()`
+        """
+    else:
+        file = rcol.text_input(
+            "Source path",
+            placeholder="path/to/file.txt",
+            help="This is the path of the file on the Streamlit hosted filesystem",
+        )
+        lcol, rcol = st.columns([3, 1])
+        destination_path = lcol.text_input(
+            "Destination path in the bucket",
+            value=file,
+        )
+        overwrite = "true" if rcol.checkbox("Overwrite if exists?") else "false"
+        constructed_storage_query = f"""
+        st_supabase.upload("{bucket_id}", {source=}, {file=}, destination_path="{destination_path}", {overwrite=})
+        """
+    st.session_state["storage_disabled"] = bool(not all([bucket_id, file]))
+    return (
+        constructed_storage_query,
+        (bucket_id,),
+        dict(source=source, file=file, destination_path=destination_path, overwrite=overwrite),
+    )
+
+
+def _render_list_buckets(bucket_id):
+    ttl = _ttl_input()
+    st.session_state["storage_disabled"] = False
+    return f"""st_supabase.list_buckets({ttl=})""", (), dict(ttl=ttl)
+
+
+def _render_download(bucket_id):
+    lcol, rcol = st.columns([3, 1])
+    source_path = lcol.text_input(
+        "Enter source path in the bucket",
+        placeholder="/folder/subFolder/file.txt",
+    )
+    ttl = _ttl_input(rcol)
+
+    st.session_state["storage_disabled"] = bool(not all([bucket_id, source_path]))
+    return (
+        f"""st_supabase.download("{bucket_id}", {source_path=}, {ttl=})""",
+        (bucket_id,),
+        dict(source_path=source_path, ttl=ttl),
+    )
+
+
+def _render_move(bucket_id):
+    from_path = st.text_input(
+        "Enter source path in the bucket",
+        placeholder="/folder/subFolder/file.txt",
+    )
+    to_path = st.text_input(
+        "Enter destination path in the bucket",
+        placeholder="/folder/subFolder/file.txt",
+        help="Path will be created if it does not exist",
+    )
+
+    st.session_state["storage_disabled"] = bool(not all([bucket_id, from_path, to_path]))
+    return (
+        f"""st_supabase.move("{bucket_id}", {from_path=}, {to_path=})""",
+        (bucket_id,),
+        dict(from_path=from_path, to_path=to_path),
+    )
+
+
+def _render_remove(bucket_id):
+    paths = st.text_input(
+        "Enter the paths of the objects in the bucket to remove",
+        placeholder="""["image.png","/folder/subFolder/file.txt"]""",
+        help="Enter as a list",
+    )
+    paths_list = _parse_list(paths, "Paths")
+
+    st.session_state["storage_disabled"] = (
+        bool(not all([bucket_id, paths])) or paths_list is _INVALID
+    )
+    return (
+        f"""st_supabase.remove("{bucket_id}", paths={paths})""",
+        (bucket_id,),
+        dict(paths=paths_list),
+    )
+
+
+def _render_list_objects(bucket_id):
+    lcol, rcol = st.columns([3, 1])
+    path = lcol.text_input(
+        "Enter the folder path to list objects from",
+        placeholder="/folder/subFolder/",
+    )
+    ttl = _ttl_input(rcol)
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    limit = col1.number_input(
+        "Number of objects to list",
+        min_value=1,
+        value=100,
+    )
+
+    offset = col2.number_input(
+        "Offset",
+        min_value=0,
+        value=0,
+    )
+
+    sortby = col3.selectbox(
+        "Select the column to sort by",
+        options=["name", "updated_at", "created_at", "last_accessed_at"],
+        index=0,
+    )
+
+    order = col4.radio(
+        "Select the sorting order",
+        options=["asc", "desc"],
+        index=0,
+        horizontal=True,
+    )
+
+    st.session_state["storage_disabled"] = not bool(bucket_id)
+    return (
+        f"""st_supabase.list_objects("{bucket_id}", {path=}, {limit=}, {offset=}, {sortby=}, {order=}, {ttl=})""",
+        (bucket_id,),
+        dict(path=path, limit=limit, offset=offset, sortby=sortby, order=order, ttl=ttl),
+    )
+
+
+def _render_get_public_url(bucket_id):
+    lcol, rcol = st.columns([3, 1])
+    filepath = lcol.text_input(
+        "Enter the path to file",
+        placeholder="/folder/subFolder/image.jpg",
+    )
+    ttl = _ttl_input(rcol)
+
+    st.session_state["storage_disabled"] = bool(not all([bucket_id, filepath]))
+    return (
+        f"""st_supabase.get_public_url("{bucket_id}",{filepath=}, {ttl=})""",
+        (bucket_id,),
+        dict(filepath=filepath, ttl=ttl),
+    )
+
+
+def _render_create_signed_urls(bucket_id):
+    lcol, rcol = st.columns([2, 1])
+    paths = lcol.text_input(
+        "Enter the list of paths to the files",
+        placeholder="['/folder/subFolder/image.jpg','file.txt']",
+    )
+
+    expires_in = rcol.number_input(
+        "Seconds until the signed URL expires",
+        min_value=0,
+        value=3600,
+    )
+    paths_list = _parse_list(paths, "Paths")
+
+    st.session_state["storage_disabled"] = (
+        bool(not all([bucket_id, paths, expires_in])) or paths_list is _INVALID
+    )
+    return (
+        f"""st_supabase.create_signed_urls("{bucket_id}",paths={paths}, {expires_in=})""",
+        (bucket_id,),
+        dict(paths=paths_list, expires_in=expires_in),
+    )
+
+
+def _render_create_signed_upload_url(bucket_id):
+    path = st.text_input(
+        "Enter the file path",
+        placeholder="/folder/subFolder/image.jpg",
+    )
+    st.session_state["storage_disabled"] = bool(not all([bucket_id, path]))
+    return (
+        f"""st_supabase.create_signed_upload_url("{bucket_id}",{path=})""",
+        (bucket_id,),
+        dict(path=path),
+    )
+
+
+def _render_upload_to_signed_url(bucket_id):
+    path = st.text_input(
+        "Enter destination path in the bucket",
+        placeholder="/folder/subFolder/image.jpg",
+    )
+    token = st.text_input(
+        "Enter the token",
+        type="password",
+        help="This is generated by `.create_signed_url()`",
+    )
+    lcol, rcol = st.columns([1, 3])
+    source = lcol.selectbox(
+        label="Source filesystem",
+        options=["local", "hosted"],
+        help="Filesystem from where the file has to be uploaded",
+    )
+    if source == "local":
+        file = rcol.file_uploader("Choose a file")
+
+        constructed_storage_query = f"""
+        st_supabase.upload_to_signed_url("{bucket_id}", {source=}, {path=}, token="***", file={_describe_uploaded_file(file)})
+        # `UploadedFile` is the `BytesIO` object returned by `st.file_uploader()`
+        """
+    else:
+        file = rcol.text_input(
+            "Source path",
+            placeholder="path/to/file.txt",
+            help="This is the path of the file on the Streamlit hosted filesystem",
+        )
+        constructed_storage_query = f"""
+        st_supabase.upload_to_signed_url("{bucket_id}", {source=}, {path=}, token="***", {file=})
+        """
+    st.session_state["storage_disabled"] = bool(not all([bucket_id, token, path, file]))
+    return (
+        constructed_storage_query,
+        (bucket_id,),
+        dict(source=source, path=path, token=token, file=file),
+    )
+
+
+STORAGE_HANDLERS = {
+    "create_bucket": _render_create_bucket,
+    "update_bucket": _render_update_bucket,
+    "delete_bucket": _render_delete_bucket,
+    "empty_bucket": _render_empty_bucket,
+    "upload": _render_upload,
+    "move": _render_move,
+    "remove": _render_remove,
+    "create_signed_upload_url": _render_create_signed_upload_url,
+    "upload_to_signed_url": _render_upload_to_signed_url,
+    "get_bucket": _render_get_bucket,
+    "list_buckets": _render_list_buckets,
+    "download": _render_download,
+    "list_objects": _render_list_objects,
+    "create_signed_urls": _render_create_signed_urls,
+    "get_public_url": _render_get_public_url,
+}
+
+
+# ---------- STORAGE RESPONSE HANDLERS ----------
+# Each handler renders the response of one storage operation. `ctx` holds the bucket id and the
+# keyword arguments the operation was run with.
+def _on_bucket_message(action, expected_message):
+    def _on_response(response, ctx):
+        if response.get("message") == expected_message:
+            st.success(f"Bucket **{ctx['bucket_id']}** {action}", icon="✅")
+        else:
+            st.write(response)
+
+    return _on_response
+
+
+def _on_bucket_changed(action, expected_message):
+    on_message = _on_bucket_message(action, expected_message)
+
+    def _on_response(response, ctx):
+        if response.get("message") == expected_message:
+            _get_bucket_props.clear(st_supabase, ctx["bucket_id"])
+        on_message(response, ctx)
+
+    return _on_response
+
+
+def _on_create_bucket(response, ctx):
+    if response.get("name") == ctx["bucket_id"]:
+        st.success(f"Bucket **{ctx['bucket_id']}** created", icon="✅")
+    else:
+        st.write(response)
+
+
+def _on_move(response, ctx):
+    if response.get("message") == "Successfully moved":
+        st.success(
+            f"Moved **{ctx['bucket_id']}/{ctx['from_path']}** to **{ctx['bucket_id']}/{ctx['to_path']}**",
+            icon="✅",
+        )
+    else:
+        st.write(response)
+
+
+def _on_upload(response, ctx):
+    full_path = getattr(response, "full_path", None)
+    if full_path == f"{ctx['bucket_id']}/{ctx['destination_path'].lstrip('/')}":
+        st.success(
+            f"Uploaded **{getattr(ctx['file'], 'name', ctx['file'])}** to **{full_path}**",
+            icon="✅",
+        )
+    else:
+        st.write(response)
+
+
+def _on_download(response, ctx):
+    file_name, mime, data = response
+    st.success(f"File **{file_name}** downloaded from Supabase")
+    st.download_button(
+        "Download to local filesystem ⏬",
+        data=data,
+        file_name=file_name,
+        mime=mime,
+        use_container_width=True,
+    )
+
+
+def _on_remove(response, ctx):
+    st.info(f"Removed **{len(response)}** objects")
+    st.write(response)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _objects_to_df(objects: list):
+    # Only listings need pandas, so most sessions never pay for importing it
+    import pandas as pd
+
+    return pd.DataFrame.from_dict(objects)
+
+
+def _on_list_objects(response, ctx):
+    st.info(f"Listing **{len(response)}** objects")
+    _df = _objects_to_df(response)
+    if len(_df) > MAX_DISPLAYED_OBJECTS:
+        st.caption(
+            f"Showing the first {MAX_DISPLAYED_OBJECTS} objects. Download the full list below."
+        )
+    st.dataframe(_df.head(MAX_DISPLAYED_OBJECTS), use_container_width=True)
+    st.download_button(
+        "Download full list",
+        _df.to_csv(index=False).encode(),
+        "objects.csv",
+        "text/csv",
+        use_container_width=True,
+    )
+
+
+def _on_get_public_url(response, ctx):
+    st.success(response, icon="🔗")
+
+
+def _on_create_signed_urls(response, ctx):
+    st.warning(f"These URLs are valid only for {ctx['expires_in']} seconds", icon="⚠️")
+    for items in response:
+        st.write(f"**File:** {items['path']}")
+        if items["signedURL"]:
+            st.success(items["signedURL"], icon="🔗")
+        else:
+            st.error(items["error"], icon="❌")
+
+
+def _on_list_buckets(response, ctx):
+    st.info(f"Listing **{len(response)}** buckets")
+    st.write(response)
+
+
+def _on_create_signed_upload_url(response, ctx):
+    st.write("Signed URL")
+    st.info(f"{response['signed_url']}", icon="🔗")
+    st.write("Token")
+    st.code(response["token"], language="text", wrap_lines=True)
+    st.write("Path")
+    st.code(response["path"], wrap_lines=True)
+
+
+def _on_upload_to_signed_url(response, ctx):
+    if response.get("Key") == f"{ctx['bucket_id']}/{ctx['path'].lstrip('/')}":
+        st.success(
+            f"Uploaded **{getattr(ctx['file'], 'name', ctx['file'])}** to **{response['Key']}**",
+            icon="✅",
+        )
+    else:
+        st.write(response)
+
+
+RESPONSE_HANDLERS = {
+    "create_bucket": _on_create_bucket,
+    "update_bucket": _on_bucket_changed("updated", "Successfully updated"),
+    "delete_bucket": _on_bucket_changed("deleted", "Successfully deleted"),
+    "empty_bucket": _on_bucket_message("emptied", "Successfully emptied"),
+    "upload": _on_upload,
+    "move": _on_move,
+    "remove": _on_remove,
+    "create_signed_upload_url": _on_create_signed_upload_url,
+    "upload_to_signed_url": _on_upload_to_signed_url,
+    "list_buckets": _on_list_buckets,
+    "download": _on_download,
+    "list_objects": _on_list_objects,
+    "create_signed_urls": _on_create_signed_urls,
+    "get_public_url": _on_get_public_url,
+}
+
+
+# ---------- DATABASE HELPERS ----------
+# Calls that may be pasted along with the operators but are already made by the demo
+_SKIPPED_OPERATORS = frozenset({"__init__", "execute"})
+
+
+# Reruns re-execute this script, which would reset a `functools.lru_cache` each time. Parsing is
+# pure, so the most recently used chains are shared across reruns and sessions instead.
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _parse_chain(operators):
+    """Parses chained operators like `.eq("id", 1).limit(5)` into `(method, args, kwargs)` steps.
+    Arguments must be literals, so no user input is ever evaluated as code."""
+    if not operators:
+        return ()
+    node = ast.parse(f"_query{operators}", mode="eval").body
+    chain = []
+    while not isinstance(node, ast.Name):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            if any(keyword.arg is None for keyword in node.keywords):
+                raise ValueError("Unpacking keyword arguments is not supported")
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+            kwargs = {keyword.arg: ast.literal_eval(keyword.value) for keyword in node.keywords}
+            attr, node = node.func.attr, node.func.value
+            if attr in _SKIPPED_OPERATORS:
+                continue
+        elif isinstance(node, ast.Attribute):
+            # Properties like `.not_` are chained without being called
+            args = kwargs = None
+            attr, node = node.attr, node.value
+        else:
+            raise ValueError(f"Unsupported operator: {ast.unparse(node)}")
+        if attr.startswith("_"):
+            raise ValueError(f"Unsupported operator: {attr}")
+        chain.append((attr, args, kwargs))
+    if node.id != "_query":
+        raise ValueError("Operators must start with a `.`")
+    return tuple(chain[::-1])
+
+
+def _format_literal(value):
+    # Strings are shown double-quoted, like the rest of the constructed code
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, str) else repr(value)
+
+
+def _format_chain(operators_chain):
+    """Renders parsed operators back into code, without the skipped calls"""
+    steps = []
+    for attr, args, kwargs in operators_chain:
+        if args is None:
+            steps.append(f".{attr}")
+            continue
+        params = [*map(_format_literal, args)]
+        params += [f"{key}={_format_literal(value)}" for key, value in kwargs.items()]
+        steps.append(f".{attr}({', '.join(params)})")
+    return "".join(steps)
+
+
+def _builder_args(request_builder, request_builder_input):
+    if request_builder == "select":
+        return (request_builder_input,)
+    if request_builder == "delete":
+        return ()
+    return (ast.literal_eval(request_builder_input),)
+
+
+def build_query(client, request_builder, table, args, kwargs, operators_chain):
+    """Builds the request for `client.table(table).<request_builder>(*args, **kwargs)` and
+    applies the parsed operators to it"""
+    query = getattr(client.table(table), request_builder)(*args, **kwargs)
+    for attr, op_args, op_kwargs in operators_chain:
+        query = getattr(query, attr)
+        if op_args is not None:
+            query = query(*op_args, **op_kwargs)
+    return query
+
+
+@st.cache_resource(max_entries=10, show_spinner=False)
+def _rows_to_table(query, fetched_at, _rows):
+    """Converts the rows to Arrow once per fetched payload and shares the table across reruns.
+    `st.dataframe` renders Arrow tables as-is, so no pandas frame is built. `fetched_at` changes
+    whenever the payload is refetched."""
+    # Only the Dataframe view needs pyarrow, so other sessions never pay for importing it
+    import pyarrow as pa
+
+    try:
+        return pa.Table.from_pylist(_rows)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns mixing types can't be typed by Arrow, let Streamlit coerce them instead
+        return _rows
+
+
+def _run_select(client, table, columns, operators_chain, count_method, ttl):
+    """Runs a select query and caches its payload, so reruns that don't change the query (like
+    switching the output view) are served from memory instead of the network"""
+
+    # Keyed on the connection itself, so projects or keys sharing a URL never share results
+    @st.cache_data(ttl=ttl, show_spinner=False, hash_funcs={SupabaseConnection: id})
+    def _fetch(client, table, columns, operators_chain, count_method):
+        response = build_query(
+            client, "select", table, (columns,), dict(count=count_method), operators_chain
+        ).execute()
+        return response.data, response.count, time.time()
+
+    return _fetch(client, table, columns, operators_chain, count_method)
 
-if "storage_disabled" not in st.session_state:
-    st.session_state["storage_disabled"] = True
 
 # ---------- SIDEBAR ----------
-with open("demo/sidebar.html", "r", encoding="UTF-8") as sidebar_file:
-    sidebar_html = sidebar_file.read().replace("{VERSION}", VERSION)
+sidebar_html = _load_sidebar_html(VERSION)
 
 with st.sidebar:
     with st.expander("💡**How to use**", expanded=True):
@@ -127,9 +917,7 @@ with st.expander("**Select project**", expanded=not st.session_state["initialize
             use_container_width=True,
         ):
             try:
-                st.session_state["client"] = st.connection(
-                    name="supabase_connection", type=SupabaseConnection, ttl=ttl
-                )
+                st.session_state["client"] = _get_connection(ttl)
                 st.session_state["initialized"] = True
                 st.session_state["project"] = "demo"
             except Exception as e:
@@ -169,13 +957,7 @@ with st.expander("**Select project**", expanded=not st.session_state["initialize
                 use_container_width=True,
             ):
                 try:
-                    st.session_state["client"] = st.connection(
-                        name="supabase_connection",
-                        type=SupabaseConnection,
-                        ttl=ttl,
-                        url=url,
-                        key=key,
-                    )
+                    st.session_state["client"] = _get_connection(ttl, url=url, key=key)
                     st.session_state["initialized"] = True
                     st.session_state["project"] = "custom"
                 except Exception as e:
@@ -204,52 +986,17 @@ if st.session_state["initialized"]:
     st.success("Client initialized!", icon="✅")
 
 if st.session_state["initialized"]:
-    storage, database, auth = st.tabs(
-        ["Explore storage 📦", "Explore database 🗄️", "Explore auth 🔐"]
+    # Unlike st.tabs, which runs every tab's body on each rerun, only the selected view is built
+    explore = st.radio(
+        "Explore",
+        options=EXPLORE_VIEWS,
+        horizontal=True,
+        label_visibility="collapsed",
     )
 
-    with storage:
+    if explore == "Explore storage 📦":
         st.subheader("📦 Run Storage Queries")
 
-        STORAGE_OPERATIONS = [
-            "Create a bucket",
-            "Update bucket",
-            "Delete a bucket",
-            "Empty a bucket",
-            "Upload a file",
-            "Move an existing file",
-            "Delete files in a bucket",
-            "Create a signed upload URL",
-            "Upload to signed URL",
-            "Retrieve a bucket",
-            "List all buckets",
-            "Download a file",
-            "List all files in a bucket",
-            "Create signed URLs",
-            "Retrieve public URL",
-        ]
-
-        RESTRICTED_STORAGE_OPERATORS = [
-            "create_bucket",
-            "update_bucket",
-            "delete_bucket",
-            "empty_bucket",
-            "upload",
-            "move",
-            "remove",
-            "create_signed_upload_url",
-            "upload_to_signed_url",
-        ]
-
-        STORAGE_OPERATORS = RESTRICTED_STORAGE_OPERATORS + [
-            "get_bucket",
-            "list_buckets",
-            "download",
-            "list_objects",
-            "create_signed_urls",
-            "get_public_url",
-        ]
-
         if st.session_state["project"] == "custom":
             st.warning(
                 "You are using your own project. Be careful while running delete, empty, and move requests!",
@@ -261,14 +1008,7 @@ if st.session_state["initialized"]:
                 icon="ℹ️",
             )
             st.write("Demo storage schema")
-            st.markdown(
-                """
-                bucket | object
-                |---|---
-                `bucket1`| `/awesome_zoom_background.jpg`
-                `bucket2`| `/folder1/folder2/lenna.png`
-                """
-            )
+            st.markdown(DEMO_STORAGE_SCHEMA)
 
         lcol, rcol = st.columns(2)
         selected_operation = lcol.selectbox(
@@ -279,9 +1019,7 @@ if st.session_state["initialized"]:
             * [storage-py API reference](https://supabase-community.github.io/storage-py/api/index.html)""",
         )
 
-        operation_query_dict = dict(zip(STORAGE_OPERATIONS, STORAGE_OPERATORS))
-
-        operation = operation_query_dict.get(selected_operation)
+        operation = OPERATION_QUERY_DICT[selected_operation]
 
         bucket_id = rcol.text_input(
             "Enter the bucket id",
@@ -290,464 +1028,83 @@ if st.session_state["initialized"]:
             help="The unique identifier for the bucket",
         )
 
-        if operation == "get_bucket":
-            ttl = st.text_input(
-                "Results cache duration",
-                value="",
-                placeholder="Optional",
-                help="Leave blank to cache indefinitely",
-            )
-            ttl = None if ttl == "" else ttl
-            constructed_storage_query = f"""st_supabase.{operation}("{bucket_id}", {ttl=})"""
-            st.session_state["storage_disabled"] = bool(not bucket_id)
-
-        elif operation in ["delete_bucket", "empty_bucket"]:
-            constructed_storage_query = f"""st_supabase.{operation}("{bucket_id}")"""
-            st.session_state["storage_disabled"] = bool(not bucket_id)
-
-        elif operation == "create_bucket":
-            col1, col2, col3, col4 = st.columns(4)
-
-            name = col1.text_input(
-                "Bucket name",
-                placeholder=bucket_id,
-                help="The name of the bucket. Defaults to bucket id",
-            )
-
-            file_size_limit = col2.number_input(
-                "Bucket file size limit",
-                min_value=0,
-                value=0,
-                help="Size limit of the files that can be uploaded to the bucket (in bytes). `0` means no limit.",
-            )
-            file_size_limit = None if file_size_limit == 0 else file_size_limit
-
-            allowed_mime_types = col3.text_area(
-                "Allowed MIME types",
-                placeholder="['text/plain','image/jpg']",
-                help="The MIME types that can be uploaded to the bucket. Enter as a list. Defaults to `None` to allow all file types.",
-            )
-            allowed_mime_types = None if len(allowed_mime_types) == 0 else allowed_mime_types
-
-            public = col4.checkbox(
-                "Public",
-                help="Whether the bucket should be publicly accessible?",
-                value=False,
-            )
-
-            constructed_storage_query = f"""st_supabase.create_bucket('{bucket_id}',{name=},{file_size_limit=},allowed_mime_types={allowed_mime_types},{public=})"""
-            st.session_state["storage_disabled"] = bool(not bucket_id)
-
-        elif operation == "update_bucket":
-            if bucket_id:
-                try:
-                    current_props = st_supabase.get_bucket(bucket_id)
-                    st.info("Current properties fetched. Update values to update properties.")
-                    col1, col2, col3 = st.columns(3)
-
-                    file_size_limit = col1.number_input(
-                        "New file size limit",
-                        min_value=0,
-                        value=current_props.file_size_limit or 0,
-                        help="Set as `0` to have no limit",
-                    )
-                    file_size_limit = None if file_size_limit == 0 else file_size_limit
-
-                    allowed_mime_types = col2.text_area(
-                        "New allowed MIME types",
-                        value=current_props.allowed_mime_types or "",
-                        help="Enter as a list. Set `None` to allow all MIME types.",
-                    )
-
-                    public = col3.checkbox(
-                        "Public",
-                        help="Whether the bucket should be publicly accessible?",
-                        value=current_props.public,
-                    )
-                    st.session_state["storage_disabled"] = False
-                except Exception as e:
-                    if e.__class__.__name__ == "StorageException":
-                        st.error(f"Bucket with id **{bucket_id}** not found", icon="❌")
-                    else:
-                        st.write(e)
-                    st.session_state["storage_disabled"] = True
-
-            constructed_storage_query = f"""st_supabase.{operation}('{bucket_id}',{file_size_limit=},allowed_mime_types={allowed_mime_types},{public=})"""
-
-        elif operation == "upload":
-            destination_path = None
-            lcol, rcol = st.columns([1, 3])
-            source = lcol.selectbox(
-                label="Source filesystem",
-                options=["local", "hosted"],
-                help="Filesystem from where the file has to be uploaded",
-            )
-
-            if source == "local":
-                file = rcol.file_uploader("Choose a file")
-                lcol, rcol = st.columns([3, 1])
-
-                destination_path = lcol.text_input(
-                    "Destination path in the bucket",
-                    value=file.name if file else "",
-                )
-                overwrite = "true" if rcol.checkbox("Overwrite if exists?") else "false"
-
-                constructed_storage_query = f"""
-                st_supabase.{operation}("{bucket_id}", {source=}, file={file}, destination_path="{destination_path}", {overwrite=})
-                # `UploadedFile` is the `BytesIO` object returned by `st.file_uploader()`
-                """
-            else:
-                file = rcol.text_input(
-                    "Source path",
-                    placeholder="path/to/file.txt",
-                    help="This is the path of the file on the Streamlit hosted filesystem",
-                )
-                lcol, rcol = st.columns([3, 1])
-                destination_path = lcol.text_input(
-                    "Destination path in the bucket",
-                    value=file,
-                )
-                overwrite = "true" if rcol.checkbox("Overwrite if exists?") else "false"
-                constructed_storage_query = f"""
-                st_supabase.{operation}("{bucket_id}", {source=}, {file=}, destination_path="{destination_path}", {overwrite=})
-                """
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, file]))
-        elif operation == "list_buckets":
-            ttl = st.text_input(
-                "Results cache duration",
-                value="",
-                placeholder="Optional",
-                help="Leave blank to cache indefinitely",
-            )
-            ttl = None if ttl == "" else ttl
-            constructed_storage_query = f"""st_supabase.{operation}({ttl=})"""
-            st.session_state["storage_disabled"] = False
-
-        elif operation == "download":
-            lcol, rcol = st.columns([3, 1])
-            source_path = lcol.text_input(
-                "Enter source path in the bucket",
-                placeholder="/folder/subFolder/file.txt",
-            )
-            ttl = rcol.text_input(
-                "Results cache duration",
-                value="",
-                placeholder="Optional",
-                help="Leave blank to cache indefinitely",
-            )
-            ttl = None if ttl == "" else ttl
-
-            constructed_storage_query = (
-                f"""st_supabase.{operation}("{bucket_id}", {source_path=}, {ttl=})"""
-            )
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, source_path]))
-
-        elif operation == "move":
-            from_path = st.text_input(
-                "Enter source path in the bucket",
-                placeholder="/folder/subFolder/file.txt",
-            )
-            to_path = st.text_input(
-                "Enter destination path in the bucket",
-                placeholder="/folder/subFolder/file.txt",
-                help="Path will be created if it does not exist",
-            )
-            constructed_storage_query = (
-                f"""st_supabase.{operation}("{bucket_id}", {from_path=}, {to_path=})"""
-            )
-
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, from_path, to_path]))
-        elif operation == "remove":
-            paths = st.text_input(
-                "Enter the paths of the objects in the bucket to remove",
-                placeholder="""["image.png","/folder/subFolder/file.txt"]""",
-                help="Enter as a list",
-            )
-            constructed_storage_query = f"""st_supabase.{operation}("{bucket_id}", paths={paths})"""
-
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, paths]))
-        elif operation == "list_objects":
-            lcol, rcol = st.columns([3, 1])
-            path = lcol.text_input(
-                "Enter the folder path to list objects from",
-                placeholder="/folder/subFolder/",
-            )
-            ttl = rcol.text_input(
-                "Results cache duration",
-                value="",
-                placeholder="Optional",
-                help="Leave blank to cache indefinitely",
-            )
-            ttl = None if ttl == "" else ttl
-
-            col1, col2, col3, col4 = st.columns(4)
-
-            limit = col1.number_input(
-                "Number of objects to list",
-                min_value=1,
-                value=100,
-            )
-
-            offset = col2.number_input(
-                "Offset",
-                min_value=0,
-                value=0,
-            )
-
-            sortby = col3.selectbox(
-                "Select the column to sort by",
-                options=["name", "updated_at", "created_at", "last_accessed_at"],
-                index=0,
-            )
-
-            order = col4.radio(
-                "Select the sorting order",
-                options=["asc", "desc"],
-                index=0,
-                horizontal=True,
-            )
-
-            constructed_storage_query = f"""st_supabase.{operation}("{bucket_id}", {path=}, {limit=}, {offset=}, {sortby=}, {order=}, {ttl=})"""
-
-            st.session_state["storage_disabled"] = not bool(bucket_id)
-
-        elif operation == "get_public_url":
-            lcol, rcol = st.columns([3, 1])
-            filepath = lcol.text_input(
-                "Enter the path to file",
-                placeholder="/folder/subFolder/image.jpg",
-            )
-            ttl = rcol.text_input(
-                "Results cache duration",
-                value="",
-                placeholder="Optional",
-                help="Leave blank to cache indefinitely",
-            )
-            ttl = None if ttl == "" else ttl
-
-            constructed_storage_query = (
-                f"""st_supabase.get_public_url("{bucket_id}",{filepath=}, {ttl=})"""
-            )
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, filepath]))
-
-        elif operation == "create_signed_urls":
-            lcol, rcol = st.columns([2, 1])
-            paths = lcol.text_input(
-                "Enter the list of paths to the files",
-                placeholder="['/folder/subFolder/image.jpg','file.txt']",
-            )
-
-            expires_in = rcol.number_input(
-                "Seconds until the signed URL expires",
-                min_value=0,
-                value=3600,
-            )
-
-            constructed_storage_query = (
-                f"""st_supabase.create_signed_urls("{bucket_id}",paths={paths}, {expires_in=})"""
-            )
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, paths, expires_in]))
-
-        elif operation == "create_signed_upload_url":
-            path = st.text_input(
-                "Enter the file path",
-                placeholder="/folder/subFolder/image.jpg",
-            )
-            constructed_storage_query = (
-                f"""st_supabase.create_signed_upload_url("{bucket_id}",{path=})"""
-            )
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, path]))
-
-        elif operation == "upload_to_signed_url":
-            path = None
-            path = st.text_input(
-                "Enter destination path in the bucket",
-                placeholder="/folder/subFolder/image.jpg",
-            )
-            token = st.text_input(
-                "Enter the token",
-                type="password",
-                help="This is generated by `.create_signed_url()`",
-            )
-            lcol, rcol = st.columns([1, 3])
-            source = lcol.selectbox(
-                label="Source filesystem",
-                options=["local", "hosted"],
-                help="Filesystem from where the file has to be uploaded",
-            )
-            overwrite = "false"
-            if source == "local":
-                file = rcol.file_uploader("Choose a file")
-
-                constructed_storage_query = f"""
-                st_supabase.{operation}("{bucket_id}", {source=}, {path=}, token="***", file={file}, {overwrite=})
-                # `UploadedFile` is the `BytesIO` object returned by `st.file_uploader()`
-                """
-            elif source == "hosted":
-                file = rcol.text_input(
-                    "Source path",
-                    placeholder="path/to/file.txt",
-                    help="This is the path of the file on the Streamlit hosted filesystem",
-                )
-                constructed_storage_query = f"""
-                st_supabase.{operation}("{bucket_id}", {source=}, {path=}, token="***", {file=}, {overwrite=})
-                """
-            st.session_state["storage_disabled"] = bool(not all([bucket_id, token, path]))
+        # Inputs are batched in a form so typing only reruns the app on submit. Operations whose
+        # widgets depend on another input (the source filesystem), or that delete or move data,
+        # need live reruns instead.
+        batched = operation not in LIVE_STORAGE_OPERATIONS
+        restricted = (
+            st.session_state["project"] == "demo" and operation in RESTRICTED_STORAGE_OPERATORS
+        )
 
-        st.write("**Constructed code**")
-        if operation == "download":
-            st.code(
-                f"file_name, mime, data = {constructed_storage_query}",
-                wrap_lines=True,
+        # Skip building inputs for operations the demo project would refuse to run anyway
+        if restricted:
+            st.info(
+                f"'{selected_operation.capitalize()}' not allowed in demo project. "
+                "Use your own project to try it out.",
+                icon="🔒",
             )
+            run_query = False
         else:
-            st.code(constructed_storage_query, wrap_lines=True)
+            with st.form(f"form_{operation}") if batched else st.container():
+                constructed_storage_query, args, kwargs = STORAGE_HANDLERS[operation](bucket_id)
 
-        if st.session_state["project"] == "demo" and operation in RESTRICTED_STORAGE_OPERATORS:
-            st.session_state["storage_disabled"] = True
-
-        if st.session_state["project"] == "demo" and operation in RESTRICTED_STORAGE_OPERATORS:
-            help = f"'{selected_operation.capitalize()}' not allowed in demo project"
-        elif st.session_state["storage_disabled"]:
-            help = "A required input is missing"
-        else:
-            help = None
-
-        if st.button(
-            "Run query 🏃",
-            use_container_width=True,
-            type="primary",
-            disabled=st.session_state["storage_disabled"],
-            help=help,
-            key="run_storage_query",
-        ):
-            try:
-                if operation == "upload":
-                    response = st_supabase.upload(
-                        bucket_id,
-                        source,
-                        file,
-                        destination_path,
-                        overwrite,
-                    )
+                # The code isn't meaningful until the bucket it runs against is known
+                if not bucket_id and operation != "list_buckets":
+                    st.info("Enter the bucket id to construct the code", icon="ℹ️")
                 elif operation == "download":
-                    file_name, mime, data = eval(constructed_storage_query)
-                    st.success(
-                        f"File **{file_name}** downloaded from Supabase to Streamlit hosted filesystem"
+                    st.write("**Constructed code**")
+                    st.code(
+                        f"file_name, mime, data = {constructed_storage_query}",
+                        wrap_lines=True,
                     )
-                    st.download_button(
-                        "Download to local filesystem ⏬",
-                        data=data,
-                        file_name=file_name,
-                        mime=mime,
+                else:
+                    st.write("**Constructed code**")
+                    st.code(constructed_storage_query, wrap_lines=True)
+
+                if batched:
+                    # Previewing submits the form without running anything, so the code above can
+                    # be checked against the new inputs first
+                    lcol, rcol = st.columns(2)
+                    lcol.form_submit_button(
+                        "Preview code 👀",
                         use_container_width=True,
+                        key="preview_storage_query",
                     )
-                elif operation == "upload_to_signed_url":
-                    response = st_supabase.upload_to_signed_url(
-                        bucket_id,
-                        source,
-                        path,
-                        token,
-                        file,
-                        overwrite,
+                    # Form inputs are only known on submit, so missing ones are reported afterwards
+                    run_query = rcol.form_submit_button(
+                        "Run query 🏃",
+                        use_container_width=True,
+                        type="primary",
+                        key="run_storage_query",
                     )
                 else:
-                    response = eval(constructed_storage_query)
-                with contextlib.suppress(TypeError, NameError):
-                    if operation == "create_bucket" and response["name"] == bucket_id:
-                        st.success(f"Bucket **{bucket_id}** created", icon="✅")
-                    elif (
-                        operation == "update_bucket"
-                        and response["message"] == "Successfully updated"
-                    ):
-                        st.success(f"Bucket **{bucket_id}** updated", icon="✅")
-                    elif (
-                        operation == "delete_bucket"
-                        and response["message"] == "Successfully deleted"
-                    ):
-                        st.success(f"Bucket **{bucket_id}** deleted", icon="✅")
-                    elif (
-                        operation == "empty_bucket"
-                        and response["message"] == "Successfully emptied"
-                    ):
-                        st.success(f"Bucket **{bucket_id}**  emptied", icon="✅")
-                    elif operation == "move" and response["message"] == "Successfully moved":
-                        st.success(
-                            f"Moved **{bucket_id}/{from_path}** to **{bucket_id}/{to_path}**",
-                            icon="✅",
-                        )
-                    elif (
-                        operation == "upload"
-                        and response.full_path == f"{bucket_id}/{destination_path.lstrip('/')}"
-                    ):
-                        try:
-                            st.success(
-                                f"Uploaded **{file.name}** to **{response.full_path}**",
-                                icon="✅",
-                            )
-                        except AttributeError:
-                            st.success(
-                                f"Uploaded **{file}** to **{response.full_path}**",
-                                icon="✅",
-                            )
-                    elif operation == "remove":
-                        st.info(f"Removed **{len(response)}** objects")
-                        st.write(response)
-                    elif operation == "list_objects":
-                        st.info(f"Listing **{len(response)}** objects")
-                        _df = pd.DataFrame.from_dict(response)
-                        st.dataframe(_df, use_container_width=True)
-                    elif operation == "get_public_url":
-                        st.success(response, icon="🔗")
-                    elif operation == "create_signed_urls":
-                        st.warning(
-                            f"These URLs are valid only for {expires_in} seconds",
-                            icon="⚠️",
-                        )
-                        for items in response:
-                            st.write(f"**File:** {items['path']}")
-                            if items["signedURL"]:
-                                st.success(items["signedURL"], icon="🔗")
-                            else:
-                                st.error(items["error"], icon="❌")
-                    elif operation == "list_buckets":
-                        st.info(f"Listing **{len(response)}** buckets")
-                        st.write(response)
-                    elif operation == "create_signed_upload_url":
-                        st.write("Signed URL")
-                        st.info(f"{response['signed_url']}", icon="🔗")
-                        st.write("Token")
-                        st.code(response["token"], language="text", wrap_lines=True)
-                        st.write("Path")
-                        st.code(response["path"], wrap_lines=True)
-                    elif operation == "upload_to_signed_url":
-                        if response["Key"] == f"{bucket_id}/{path.lstrip('/')}":
-                            try:
-                                st.success(
-                                    f"Uploaded **{file.name}** to **{response['Key']}**",
-                                    icon="✅",
-                                )
-                            except AttributeError:
-                                st.success(
-                                    f"Uploaded **{file}** to **{response['Key']}**",
-                                    icon="✅",
-                                )
-                    else:
-                        st.write(response)
-            except Exception as e:
-                if e.__class__.__name__ == "ConnectError":
-                    st.error(
-                        "Could not connect. Please check the Supabase URL provided",
-                        icon="❌",
+                    run_query = st.button(
+                        "Run query 🏃",
+                        use_container_width=True,
+                        type="primary",
+                        disabled=st.session_state["storage_disabled"],
+                        help=(
+                            "A required input is missing"
+                            if st.session_state["storage_disabled"]
+                            else None
+                        ),
+                        key="run_storage_query",
                     )
+
+        if run_query and st.session_state["storage_disabled"]:
+            st.warning("A required input is missing", icon="⚠️")
+        elif run_query:
+            try:
+                response = getattr(st_supabase, operation)(*args, **kwargs)
+                handler = RESPONSE_HANDLERS.get(operation)
+                if handler:
+                    handler(response, dict(bucket_id=bucket_id, **kwargs))
                 else:
-                    st.error(
-                        e,
-                        icon="❌",
-                    )
+                    st.write(response)
+            except Exception as e:
+                st.error(_ERROR_MESSAGES.get(type(e), e), icon="❌")
 
-    with database:
+    elif explore == "Explore database 🗄️":
         st.subheader("🗄️ Run Database Queries")
 
         if st.session_state["project"] == "custom":
@@ -761,18 +1118,7 @@ if st.session_state["initialized"]:
                 icon="ℹ️",
             )
             st.write("Demo database schema")
-            st.markdown(
-                """
-                | Table | Columns | Size
-                |---|---|---
-                |`cities`| `id`, `country_id`, `name` | 2
-                |`countries`| `id`, `name`, `iso2`, `iso3`, `local_name`, `continent` | 249
-                |`messages`| `sender_id`, `receiver_id`, `content` | 2
-                |`teams`| `id`, `name` | 2
-                |`users`| `id`, `name` | 2
-                |`users_teams`| `user_id`, `team_id` | 3
-                """
-            )
+            st.markdown(DEMO_DATABASE_SCHEMA)
         if st.session_state["project"] == "demo":
             table = st.selectbox(
                 "Select the table name",
@@ -800,16 +1146,23 @@ if st.session_state["initialized"]:
         )
         count_method = mcol.selectbox(
             "Enter the count method",
-            options=[None, "exact", "planned", "estimated"],
+            options=[None, "estimated", "planned", "exact"],
+            index=0,
             help=f"""
             Count algorithm to use to count {request_builder}ed rows.  
             `None`: Does not return a count.  
-            `"exact"`: Exact but slow count algorithm. Performs a `COUNT(*)` under the hood.  
-            `"planned"`: Approximated but fast count algorithm. Uses the Postgres statistics under the hood.  
             `"estimated"`: Uses exact count for low numbers and planned count for high numbers.  
+            `"planned"`: Approximated but fast count algorithm. Uses the Postgres statistics under the hood.  
+            `"exact"`: Exact but slow count algorithm. Performs a `COUNT(*)` under the hood.  
             """,
         )
         rcol_placeholder = rcol.empty()
+        if count_method == "exact":
+            st.warning(
+                '`"exact"` runs a `COUNT(*)` over every matching row, which is slow on large tables. '
+                'Prefer `"estimated"` unless you need the exact number.',
+                icon="⚠️",
+            )
 
         if request_builder == "insert":
             request_builder_query_label = "Enter the rows to insert as json (for single row) or array of jsons (for multiple rows)"
@@ -821,7 +1174,7 @@ if st.session_state["initialized"]:
                 "Cache duration",
                 value=0,
                 placeholder=0,
-                help="Set as `0` to always fetch the latest results (recommended for DML), or leave blank to cache indefinitely.",
+                help=DML_TTL_HELP,
             )
             upsert = rcol2.checkbox(
                 label="Upsert",
@@ -833,7 +1186,7 @@ if st.session_state["initialized"]:
                 "Result cache duration",
                 value=None,
                 placeholder=None,
-                help="Set as `0` to always fetch the latest results, or leave blank to cache indefinitely.",
+                help=SELECT_TTL_HELP,
             )
             placeholder = value = "*"
         elif request_builder == "delete":
@@ -843,7 +1196,7 @@ if st.session_state["initialized"]:
                 "Results Cache duration",
                 value=0,
                 placeholder=0,
-                help="Set as `0` to always fetch the latest results (recommended for DML), or leave blank to cache indefinitely.",
+                help=DML_TTL_HELP,
             )
         elif request_builder == "upsert":
             request_builder_query_label = "Enter the rows to upsert as json (for single row) or array of jsons (for multiple rows)"
@@ -853,7 +1206,7 @@ if st.session_state["initialized"]:
                 "Cache duration",
                 value=0,
                 placeholder=0,
-                help="Set as `0` to always fetch the latest results (recommended for DML), or leave blank to cache indefinitely.",
+                help=DML_TTL_HELP,
             )
             ignore_duplicates = rcol2.checkbox(
                 label="Ignore duplicates",
@@ -866,129 +1219,164 @@ if st.session_state["initialized"]:
                 "Result cache duration",
                 value=0,
                 placeholder=0,
-                help="Set as `0` to always fetch the latest results (recommended for DML), or leave blank to cache indefinitely.",
+                help=DML_TTL_HELP,
             )
 
-        request_builder_query = st.text_input(
-            label=request_builder_query_label,
-            placeholder=placeholder,
-            value=value,
-            help="[RequestBuilder API reference](https://postgrest-py.readthedocs.io/en/latest/api/request_builders.html#postgrest.AsyncRequestBuilder)",
-            disabled=request_builder == "delete",
-        )
-        if request_builder == "upsert" and not ignore_duplicates:
-            on_conflict = st.text_input(
-                label="Enter the columns to be considered UNIQUE in case of conflicts as comma-separated values",
-                placeholder="id",
-                value="id",
-                help="Specified columns to be made to work with UNIQUE constraint.",
-            )
+        ttl = None if ttl == "" else ttl
 
-        request_builder_query = (
-            f'"{request_builder_query}"' if request_builder == "select" else request_builder_query
-        )
-        request_builder_query = (
-            f'count="{count_method}"'
-            if request_builder == "delete"
-            else f'{request_builder_query}, count="{count_method}"'
-        )
-        if upsert:
-            request_builder_query = f'{request_builder_query}, upsert="{upsert}"'
-
-        if request_builder not in ["insert", "update", "upsert"]:
-            operators = st.text_input(
-                label="Chain any modifiers and filters you want 🔗",
-                value=""".eq("continent","Asia").order("name",desc=True).limit(5)""",
-                placeholder=""".eq("continent","Asia").order("name",desc=True).limit(5)""",
-                help="List of all available [operators](https://postgrest-py.readthedocs.io/en/latest/api/request_builders.html#postgrest.AsyncSelectRequestBuilder) and [filters](https://postgrest-py.readthedocs.io/en/latest/api/filters.html#postgrest.AsyncFilterRequestBuilder)",
+        # Only the query panel reruns when its own widgets change, e.g. switching the output view
+        @st.fragment
+        def _database_query_panel():
+            operators = None
+
+            request_builder_input = st.text_input(
+                label=request_builder_query_label,
+                placeholder=placeholder,
+                value=value,
+                help=REQUEST_BUILDER_HELP,
+                disabled=request_builder == "delete",
             )
+            if request_builder == "upsert" and not ignore_duplicates:
+                on_conflict = st.text_input(
+                    label="Enter the columns to be considered UNIQUE in case of conflicts as comma-separated values",
+                    placeholder="id",
+                    value="id",
+                    help="Specified columns to be made to work with UNIQUE constraint.",
+                )
 
-            operators = operators.replace(".__init__()", "").replace(".execute()", "")
+            if request_builder not in _WRITES_ROWS:
+                operators = st.text_input(
+                    label="Chain any modifiers and filters you want 🔗",
+                    value=DEFAULT_OPERATORS,
+                    placeholder=DEFAULT_OPERATORS,
+                    help=OPERATORS_HELP,
+                )
 
-        ttl = None if ttl == "" else ttl
+            try:
+                operators_chain = _parse_chain(operators)
+            except (ValueError, SyntaxError) as e:
+                st.error(f"Could not parse the operators: {e}", icon="❌")
+                operators_chain = None
+            else:
+                operators = _format_chain(operators_chain)
+
+            if request_builder == "delete":
+                query_args = []
+            elif request_builder == "select":
+                query_args = [f'"{request_builder_input}"']
+            else:
+                query_args = [request_builder_input]
+            query_args.append(f'count="{count_method}"' if count_method else "count=None")
+            if upsert:
+                query_args.append("upsert=True")
+            constructed_db_query = f"""execute_query(st_supabase.table("{table}").{request_builder}({", ".join(query_args)}){operators or ""}, {ttl=})"""
+
+            # Nothing to run until the request builder input is filled in
+            missing_input = request_builder != "delete" and not request_builder_input.strip()
+            if missing_input:
+                st.info(f"{request_builder_query_label} to construct the query", icon="ℹ️")
+            else:
+                st.write("**Constructed query**")
+                st.code(constructed_db_query, wrap_lines=True)
 
-        if operators:
-            constructed_db_query = (
-                f"""execute_query(st_supabase.table("{table}").select({request_builder_query}){operators}, {ttl=})"""
-                if request_builder == "select"
-                else f"""execute_query(st_supabase.table("{table}").{request_builder}({request_builder_query}){operators}, {ttl=})"""
+            lcol, rcol = st.columns([2, 1])
+            view = lcol.radio(
+                label="View output as",
+                options=["Dataframe", "Dict (recommended for joins)"],
+                horizontal=True,
             )
-        elif request_builder == "select":
-            constructed_db_query = f"""execute_query(st_supabase.table("{table}").select({request_builder_query}), {ttl=})"""
-        else:
-            constructed_db_query = f"""execute_query(st_supabase.table("{table}").{request_builder}({request_builder_query}), {ttl=})"""
-        st.write("**Constructed query**")
-        st.code(constructed_db_query, wrap_lines=True)
-
-        lcol, rcol = st.columns([2, 1])
-        view = lcol.radio(
-            label="View output as",
-            options=["Dataframe", "Dict (recommended for joins)"],
-            horizontal=True,
-        )
 
-        if rcol.button(
-            "Execute query 🏃",
-            use_container_width=True,
-            type="primary",
-            disabled=st.session_state["project"] == "demo"
-            and request_builder in ["insert", "upsert", "update", "delete"],
-            help=(
-                f"{request_builder.upper()} not allowed in demo project"
+            demo_disabled_help = (
+                _DEMO_DISABLED.get(request_builder)
                 if st.session_state["project"] == "demo"
-                and request_builder in ["insert", "upsert", "update", "delete"]
                 else None
-            ),
-            key="run_db_query",
-        ):
-            try:
-                response = eval(constructed_db_query)
+            )
+            run_db_query = rcol.button(
+                "Execute query 🏃",
+                use_container_width=True,
+                type="primary",
+                disabled=missing_input or operators_chain is None or demo_disabled_help is not None,
+                help=demo_disabled_help,
+                key="run_db_query",
+            )
+            # Keep showing the last select results on reruns, e.g. when switching the output view.
+            # They are re-displayed from the session, so reruns never query again, and only while
+            # the same query runs against the same connection.
+            last_select = st.session_state.get("last_select")
+            rerender_select = (
+                not run_db_query
+                and request_builder == "select"
+                and last_select is not None
+                and last_select["query"] == constructed_db_query
+                and last_select["connection"] is st_supabase
+            )
 
-                if count_method:
-                    st.write(
-                        f"**{response.count}** rows {request_builder}ed. `count` does not take `limit` into account."
-                    )
-                if view == "Dataframe":
-                    st.dataframe(response.data, use_container_width=True)
-                else:
-                    st.write(response.data)
-            except ValueError:
-                if count_method == "planned":
-                    st.error(
-                        "Operation too small for `planned` count method. Please change count method."
-                    )
-            except Exception as e:
-                if e.__class__.__name__ == "ConnectError":
-                    st.error(
-                        "Could not connect. Please check the Supabase URL provided",
-                        icon="❌",
-                    )
+            if run_db_query or rerender_select:
+                try:
+                    builder_args = _builder_args(request_builder, request_builder_input)
+                except (ValueError, SyntaxError) as e:
+                    st.error(f"Could not parse the query: {e}", icon="❌")
                 else:
-                    st.error(
-                        e,
-                        icon="❌",
-                    )
+                    try:
+                        if request_builder == "select":
+                            if rerender_select:
+                                data = last_select["data"]
+                                count = last_select["count"]
+                                fetched_at = last_select["fetched_at"]
+                            else:
+                                data, count, fetched_at = _run_select(
+                                    st_supabase,
+                                    table,
+                                    request_builder_input,
+                                    operators_chain,
+                                    count_method,
+                                    ttl,
+                                )
+                                st.session_state["last_select"] = dict(
+                                    query=constructed_db_query,
+                                    connection=st_supabase,
+                                    data=data,
+                                    count=count,
+                                    fetched_at=fetched_at,
+                                )
+                            if view == "Dataframe":
+                                data = _rows_to_table(constructed_db_query, fetched_at, data)
+                        else:
+                            response = execute_query(
+                                build_query(
+                                    st_supabase,
+                                    request_builder,
+                                    table,
+                                    builder_args,
+                                    dict(
+                                        count=count_method, **({"upsert": upsert} if upsert else {})
+                                    ),
+                                    operators_chain,
+                                ),
+                                ttl=ttl,
+                            )
+                            data, count = response.data, response.count
 
-    with auth:
-        st.subheader("🔐 Run Auth Queries")
+                        if count_method:
+                            st.write(
+                                f"**{count}** rows {request_builder}ed. `count` does not take `limit` into account."
+                            )
+                        if view == "Dataframe":
+                            st.dataframe(data, use_container_width=True)
+                        else:
+                            st.json(data)
+                    except ValueError:
+                        if count_method == "planned":
+                            st.error(
+                                "Operation too small for `planned` count method. Please change count method."
+                            )
+                    except Exception as e:
+                        st.error(_ERROR_MESSAGES.get(type(e), e), icon="❌")
 
-        AUTH_OPERATIONS = [
-            "Create a new user",
-            "Sign in with password",
-            "Sign in with OTP",
-            "Retrieve session",
-            "Retrieve user",
-            "Sign out",
-        ]
-
-        AUTH_OPERATORS = [
-            "sign_up",
-            "sign_in_with_password",
-            "sign_in_with_otp",
-            "get_session",
-            "get_user",
-            "sign_out",
-        ]
+        _database_query_panel()
+
+    elif explore == "Explore auth 🔐":
+        st.subheader("🔐 Run Auth Queries")
 
         selected_auth_operation = st.selectbox(
             label="Select operation",
@@ -996,8 +1384,7 @@ if st.session_state["initialized"]:
             help="[Supabase Auth API reference](https://supabase.com/docs/reference/python/auth-signup)",
         )
 
-        auth_operation_query_dict = dict(zip(AUTH_OPERATIONS, AUTH_OPERATORS))
-        auth_operation = auth_operation_query_dict.get(selected_auth_operation)
+        auth_operation = AUTH_OPERATION_QUERY_DICT[selected_auth_operation]
 
         if auth_operation == "sign_up":
             lcol, rcol = st.columns(2)
@@ -1020,6 +1407,13 @@ if st.session_state["initialized"]:
             )
 
             constructed_auth_query = f"st_supabase.auth.{auth_operation}(dict({email=}, {password=}, options=dict(data=dict({fname=},{attribution=}))))"
+            auth_args = (
+                dict(
+                    email=email,
+                    password=password,
+                    options=dict(data=dict(fname=fname, attribution=attribution)),
+                ),
+            )
 
         elif auth_operation == "sign_in_with_password":
             lcol, rcol = st.columns(2)
@@ -1034,6 +1428,7 @@ if st.session_state["initialized"]:
             constructed_auth_query = (
                 f"st_supabase.auth.{auth_operation}(dict({email=}, {password=}))"
             )
+            auth_args = (dict(email=email, password=password),)
 
         elif auth_operation == "sign_in_with_otp":
             st.info(
@@ -1062,8 +1457,9 @@ st_supabase.auth.verify_otp(dict(type="magiclink", email=email, token=token))
                 """
             )
             constructed_auth_query = None
-        elif auth_operation in ["get_session", "get_user", "sign_out"]:
+        elif auth_operation in _NO_ARG_AUTH_OPERATORS:
             constructed_auth_query = f"st_supabase.auth.{auth_operation}()"
+            auth_args = ()
 
         if constructed_auth_query:
             st.write("**Constructed code**")
@@ -1077,11 +1473,11 @@ st_supabase.auth.verify_otp(dict(type="magiclink", email=email, token=token))
             disabled=not constructed_auth_query,
         ):
             try:
-                response = eval(constructed_auth_query)
+                response = getattr(st_supabase.auth, auth_operation)(*auth_args)
 
                 if auth_operation == "sign_up":
                     auth_success_message = f"User created. Welcome {fname or ''} 🚀"
-                elif auth_operation in "sign_in_with_password":
+                elif auth_operation == "sign_in_with_password":
                     auth_success_message = f"""Logged in. Welcome {response.dict()["user"]["user_metadata"]["fname"] or ''}  🔓"""
                 elif auth_operation == "sign_out":
                     auth_success_message = "Signed out 🔒"
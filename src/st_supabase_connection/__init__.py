@@ -1,11 +1,19 @@
+import logging
 import mimetypes
 import os
+import threading
+import time
 import urllib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from functools import lru_cache
 from io import BytesIO
+from itertools import islice
 from pathlib import Path
-from typing import Literal, Optional, Tuple, Union
+from typing import Iterable, Iterator, Literal, Optional, Tuple, Union
 
+import httpx
 from postgrest import (
     APIResponse,
     SyncFilterRequestBuilder,
@@ -14,10 +22,51 @@ from postgrest import (
 )
 from streamlit import cache_data, cache_resource
 from streamlit.connections import BaseConnection
+from streamlit.time_util import time_to_seconds
 from supabase import Client, create_client
 
 __version__ = "2.0.1"
 
+_REMOVE_MAX_WORKERS = 8
+# Seconds before expiry at which cached signed URLs are dropped
+_SIGNED_URL_MARGIN = 60
+_SIGNED_URLS_MAX_ENTRIES = 256
+# Reads whose last result is kept to fall back on when Supabase is unreachable
+_LAST_RESULTS_MAX_ENTRIES = 32
+
+logger = logging.getLogger(__name__)
+
+
+class BatchError(Exception):
+    """Raised when some batches of a batched operation fail after others have succeeded.
+
+    Attributes
+    ----------
+    completed : list
+        Results of the batches that succeeded, as returned by the API.
+    failed : list
+        Inputs of the batches that failed.
+    """
+
+    def __init__(self, message: str, completed: list, failed: list):
+        super().__init__(message)
+        self.completed = completed
+        self.failed = failed
+
+
+@lru_cache(maxsize=1024)
+def _guess_mime(path: Union[str, Path]) -> Optional[str]:
+    return mimetypes.guess_type(path)[0]
+
+
+def _mime_type_list(allowed_mime_types: Optional[Iterable[str]]) -> Optional["list[str]"]:
+    """Normalizes allowed MIME types to the list the storage API expects"""
+    if allowed_mime_types is None:
+        return None
+    if isinstance(allowed_mime_types, str):
+        return [allowed_mime_types]
+    return list(allowed_mime_types)
+
 
 class SupabaseConnection(BaseConnection[Client]):
     """
@@ -36,40 +85,65 @@ class SupabaseConnection(BaseConnection[Client]):
         Perform a table operation
     """
 
-    def _connect(self, **kwargs) -> None:
-        if "url" in kwargs:
-            url = kwargs.pop("url")
-        elif "SUPABASE_URL" in self._secrets:
-            url = self._secrets["SUPABASE_URL"]
-        elif "SUPABASE_URL" in os.environ:
-            url = os.environ.get("SUPABASE_URL")
-        else:
-            raise ConnectionRefusedError(
-                "Supabase URL not provided. "
-                "You can provide the url by "
-                "passing it as the 'url' kwarg while creating the connection, or "
-                "setting the 'SUPABASE_URL' Streamlit secret or environment variable."
-            )
+    def _resolve(self, kwargs: dict, kwarg: str, label: str) -> str:
+        """Looks up a credential in the connection kwargs, then in Streamlit secrets, then in
+        environment variables"""
+        name = f"SUPABASE_{kwarg.upper()}"
+        if kwarg in kwargs:
+            return kwargs.pop(kwarg)
+        if name in self._secrets:
+            return self._secrets[name]
+        if name in os.environ:
+            return os.environ[name]
+        raise ConnectionRefusedError(
+            f"Supabase {label} not provided. "
+            f"You can provide the {kwarg} by "
+            f"passing it as the '{kwarg}' kwarg while creating the connection, or "
+            f"setting the '{name}' Streamlit secret or environment variable."
+        )
 
-        if "key" in kwargs:
-            key = kwargs.pop("key")
-        elif "SUPABASE_KEY" in self._secrets:
-            key = self._secrets["SUPABASE_KEY"]
-        elif "SUPABASE_KEY" in os.environ:
-            key = os.environ.get("SUPABASE_KEY")
-        else:
-            raise ConnectionRefusedError(
-                "Supabase Key not provided. "
-                "You can provide the key by "
-                "passing it as the 'key' kwarg while creating the connection, or "
-                "setting the 'SUPABASE_KEY' Streamlit secret or environment variable."
-            )
+    def _connect(self, **kwargs) -> None:
+        url = self._resolve(kwargs, "url", "URL")
+        key = self._resolve(kwargs, "key", "Key")
 
         self.client = create_client(url, key)
         self.table = self.client.table
         self.auth = self.client.auth
         self.delete_bucket = self.client.storage.delete_bucket
         self.empty_bucket = self.client.storage.empty_bucket
+        self._storage_request = self.client.storage._request
+        self._buckets = {}
+        self._last_results = OrderedDict()
+        # The connection is shared by every session, so script threads read these concurrently
+        self._last_results_lock = threading.Lock()
+
+    def _bucket(self, bucket_id: str):
+        """Returns the storage file API of a bucket, reusing the one built for earlier calls"""
+        if bucket_id not in self._buckets:
+            self._buckets[bucket_id] = self.client.storage.from_(bucket_id)
+        return self._buckets[bucket_id]
+
+    def _read_or_last(self, fetch, *args):
+        """Runs the cached read `fetch(self, *args)` and remembers its result. If Supabase cannot be
+        reached, the last result of the same read is returned instead of raising. Only the results
+        of the most recently used reads are kept."""
+        key = (fetch.__name__, *args)
+        try:
+            result = fetch(self, *args)
+        except httpx.TransportError as e:
+            with self._last_results_lock:
+                if key not in self._last_results:
+                    raise
+                self._last_results.move_to_end(key)
+                last_result = self._last_results[key]
+            logger.warning("Supabase unreachable (%s), serving the last result of %s", e, key[0])
+            return last_result
+        with self._last_results_lock:
+            self._last_results[key] = result
+            self._last_results.move_to_end(key)
+            if len(self._last_results) > _LAST_RESULTS_MAX_ENTRIES:
+                self._last_results.popitem(last=False)
+        return result
 
     def get_bucket(
         self,
@@ -78,6 +152,10 @@ class SupabaseConnection(BaseConnection[Client]):
     ):
         """Retrieves the details of an existing storage bucket.
 
+        If Supabase cannot be reached (an `httpx.TransportError`), the last result fetched for the
+        same arguments is returned instead, so it may be stale. A warning is logged when this
+        happens. The error is raised if there is no earlier result.
+
         Parameters
         ----------
         bucket_id : str
@@ -86,11 +164,11 @@ class SupabaseConnection(BaseConnection[Client]):
             The maximum time to keep an entry in the cache. Defaults to `None` (cache never expires).
         """
 
-        @cache_resource(ttl=ttl)
-        def _get_bucket(_self, bucket_id):
-            return _self.client.storage.get_bucket(bucket_id)
+        @cache_resource(ttl=ttl, hash_funcs={SupabaseConnection: id})
+        def _get_bucket(conn, bucket_id):
+            return conn.client.storage.get_bucket(bucket_id)
 
-        return _get_bucket(self, bucket_id)
+        return self._read_or_last(_get_bucket, bucket_id)
 
     def list_buckets(
         self,
@@ -98,17 +176,21 @@ class SupabaseConnection(BaseConnection[Client]):
     ) -> list:
         """Retrieves the details of all storage buckets within an existing product.
 
+        If Supabase cannot be reached (an `httpx.TransportError`), the last result fetched for the
+        same arguments is returned instead, so it may be stale. A warning is logged when this
+        happens. The error is raised if there is no earlier result.
+
         Parameters
         ----------
         ttl : float, timedelta, str, or None
             The maximum time to keep an entry in the cache. Defaults to `None` (cache never expires).
         """
 
-        @cache_resource(ttl=ttl)
-        def _list_buckets(_self):
-            return _self.client.storage.list_buckets()
+        @cache_resource(ttl=ttl, hash_funcs={SupabaseConnection: id})
+        def _list_buckets(conn):
+            return conn.client.storage.list_buckets()
 
-        return _list_buckets(self)
+        return self._read_or_last(_list_buckets)
 
     def create_bucket(
         self,
@@ -116,7 +198,7 @@ class SupabaseConnection(BaseConnection[Client]):
         name: Optional[str] = None,
         public: Optional[bool] = False,
         file_size_limit: Optional[int] = None,
-        allowed_mime_types: Optional["list[str]"] = None,
+        allowed_mime_types: Optional[Union[str, Iterable[str]]] = None,
     ) -> "dict[str, str]":
         """Creates a new storage bucket.
 
@@ -130,10 +212,10 @@ class SupabaseConnection(BaseConnection[Client]):
             Whether the created bucket should be publicly accessible. Defaults to False.
         file_size_limit : int
             Maximum size (in bytes) of files that can be uploaded to this bucket. Pass `None` to have no limits. Defaults to `None`.
-        allowed_mime_types : list[str]
-            List of file types that can be uploaded to this bucket. Pass `None` to allow all file types. Defaults to `None`.
+        allowed_mime_types : str or list[str]
+            File type, or list of file types, that can be uploaded to this bucket. Pass `None` to allow all file types. Defaults to `None`.
         """
-        response = self.client.storage._request(
+        response = self._storage_request(
             method="POST",
             url="/bucket",
             json={
@@ -141,7 +223,7 @@ class SupabaseConnection(BaseConnection[Client]):
                 "name": name or id,
                 "public": public,
                 "file_size_limit": file_size_limit,
-                "allowed_mime_types": allowed_mime_types,
+                "allowed_mime_types": _mime_type_list(allowed_mime_types),
             },
         )
         return response.json()
@@ -174,21 +256,18 @@ class SupabaseConnection(BaseConnection[Client]):
         """
 
         if source == "local":
-            with open(file.name, "wb") as f:
-                f.write(file.getbuffer())
-            with open(file.name, "rb") as f:
-                response = self.client.storage.from_(bucket_id).upload(
-                    path=destination_path or f"/{file.name}",
-                    file=f,
-                    file_options={"content-type": file.type, "x-upsert": overwrite},
-                )
+            response = self._bucket(bucket_id).upload(
+                path=destination_path or f"/{file.name}",
+                file=file.getvalue(),
+                file_options={"content-type": file.type, "x-upsert": overwrite},
+            )
         elif source == "hosted":
             with open(file, "rb") as f:
-                response = self.client.storage.from_(bucket_id).upload(
+                response = self._bucket(bucket_id).upload(
                     path=destination_path or f"/{os.path.basename(f.name)}",
                     file=f,
                     file_options={
-                        "content-type": mimetypes.guess_type(file)[0],
+                        "content-type": _guess_mime(file),
                         "x-upsert": overwrite,
                     },
                 )
@@ -199,7 +278,8 @@ class SupabaseConnection(BaseConnection[Client]):
         bucket_id: str,
         source_path: str,
         ttl: Optional[Union[float, timedelta, str]] = None,
-    ) -> Tuple[str, str, bytes]:
+        max_entries: Optional[int] = None,
+    ) -> Tuple[str, str, BytesIO]:
         """Downloads a file.
 
         Parameters
@@ -210,6 +290,9 @@ class SupabaseConnection(BaseConnection[Client]):
             Path of the file relative in the bucket, including file name
         ttl : float, timedelta, str, or None
             The maximum time to keep an entry in the cache. Defaults to `None` (cache never expires).
+        max_entries : int or None
+            The maximum number of downloads to keep in the cache. The oldest entry is removed
+            when a new one is added to a full cache. Defaults to `None` (unbounded cache).
 
         Returns
         -------
@@ -217,31 +300,65 @@ class SupabaseConnection(BaseConnection[Client]):
             Name of the file, inferred from the `source_path`
         mime : str
             MIME-type of the object
-        data : bytes
-            Downloaded bytes object
+        data : BytesIO
+            In-memory buffer holding the downloaded bytes
         """
 
-        @cache_resource(ttl=ttl)
-        def _download(_self, bucket_id, source_path):
-            file_name = source_path.split("/")[-1]
-
-            with open(file_name, "wb+") as f:
-                response = _self.client.storage.from_(bucket_id).download(source_path)
-                f.write(response)
-
-            mime = mimetypes.guess_type(file_name)[0]
-            data = open(file_name, "rb")
+        @cache_data(ttl=ttl, max_entries=max_entries, hash_funcs={SupabaseConnection: id})
+        def _download(conn, bucket_id, source_path):
+            file_name = source_path.rpartition("/")[2]
+            data = BytesIO(conn._bucket(bucket_id).download(source_path))
+            mime = _guess_mime(file_name)
 
             return file_name, mime, data
 
         return _download(self, bucket_id, source_path)
 
+    def download_stream(
+        self,
+        bucket_id: str,
+        source_path: str,
+        chunk_size: int = 1 << 20,
+    ) -> Iterator[bytes]:
+        """Downloads a file in chunks, without holding the whole file in memory.
+        Unlike `download()`, results are not cached.
+
+        Parameters
+        ----------
+        bucket_id : str
+            Unique identifier of the bucket.
+        source_path : str
+            Path of the file relative in the bucket, including file name
+        chunk_size : int
+            Maximum size (in bytes) of each yielded chunk. Defaults to 1 MiB.
+
+        Yields
+        ------
+        bytes
+            The next chunk of the file
+        """
+        from storage3.utils import StorageException
+
+        _path = self._bucket(bucket_id)._get_final_path(source_path)
+        # storage3 has no streaming download, so this goes through its private httpx client, which
+        # resolves the relative path against the storage `base_url` it was created with
+        with self.client.storage._client.stream("GET", f"/object/{_path}") as response:
+            if response.is_error:
+                response.read()
+                try:
+                    error = response.json()
+                except ValueError:
+                    # Gateways can answer with an HTML page or an empty body instead of JSON
+                    error = {"statusCode": response.status_code, "error": response.text}
+                raise StorageException(error)
+            yield from response.iter_bytes(chunk_size)
+
     def update_bucket(
         self,
         bucket_id: str,
         public: Optional[bool] = False,
         file_size_limit: Optional[bool] = None,
-        allowed_mime_types: Optional[Union[str, "list[str]"]] = None,
+        allowed_mime_types: Optional[Union[str, Iterable[str]]] = None,
     ) -> "dict[str, str]":
         """Update a storage bucket.
 
@@ -253,17 +370,17 @@ class SupabaseConnection(BaseConnection[Client]):
             Whether the bucket will be publicly accessible. Defaults to `False`
         file_size_limit : int
             Size limit of the files that can be uploaded to the bucket. Set as `None` to have no limit. Defaults to `None`.
-        allowed_mime_types : str
-            The file MIME types that can be uploaded to the bucket. Set as `None` to allow all types. Defaults to `None`.
+        allowed_mime_types : str or list[str]
+            The file MIME type, or list of types, that can be uploaded to the bucket. Set as `None` to allow all types. Defaults to `None`.
         """
         json = {
             "id": bucket_id,
             "name": bucket_id,
             "public": public,
             "file_size_limit": file_size_limit,
-            "allowed_mime_types": allowed_mime_types,
+            "allowed_mime_types": _mime_type_list(allowed_mime_types),
         }
-        response = self.client.storage._request("PUT", f"/bucket/{bucket_id}", json=json)
+        response = self._storage_request("PUT", f"/bucket/{bucket_id}", json=json)
         return response.json()
 
     def move(self, bucket_id: str, from_path: str, to_path: str) -> "dict[str, str]":
@@ -278,7 +395,7 @@ class SupabaseConnection(BaseConnection[Client]):
         to_path : str
             The new file path, including the new file name. Path will be created if it doesn't exist.
         """
-        response = self.client.storage._request(
+        response = self._storage_request(
             "POST",
             "/object/move",
             json={
@@ -289,7 +406,7 @@ class SupabaseConnection(BaseConnection[Client]):
         )
         return response.json()
 
-    def remove(self, bucket_id: str, paths: list) -> "dict[str, str]":
+    def remove(self, bucket_id: str, paths: list, chunk_size: int = 100) -> "dict[str, str]":
         """Deletes files within the same bucket
 
         Parameters
@@ -298,13 +415,46 @@ class SupabaseConnection(BaseConnection[Client]):
             Unique identifier of the bucket where the object is.
         paths : list
             An array or list of files to be deletes, including the path and file name. For example [`folder/image.png`].
+        chunk_size : int
+            Maximum number of paths sent in a single request. Longer lists are deleted in parallel
+            batches of this size. Defaults to 100.
+
+        Batches are not atomic: if some fail, the others still delete their objects. Every batch
+        is attempted, then a `BatchError` is raised, chained to the first error. Its `completed`
+        attribute holds the deleted objects and `failed` the paths of the batches that failed.
         """
-        response = self.client.storage._request(
-            "DELETE",
-            f"/object/{bucket_id}",
-            json={"prefixes": paths},
-        )
-        return response.json()
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        def _remove(prefixes):
+            response = self._storage_request(
+                "DELETE",
+                f"/object/{bucket_id}",
+                json={"prefixes": prefixes},
+            )
+            return response.json()
+
+        if len(paths) <= chunk_size:
+            return _remove(paths)
+
+        chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        with ThreadPoolExecutor(max_workers=min(_REMOVE_MAX_WORKERS, len(chunks))) as executor:
+            futures = [executor.submit(_remove, chunk) for chunk in chunks]
+
+        removed, failed, error = [], [], None
+        for chunk, future in zip(chunks, futures):
+            try:
+                removed.extend(future.result())
+            except Exception as e:
+                failed.extend(chunk)
+                error = error or e
+        if error is not None:
+            raise BatchError(
+                f"Removing {len(failed)} of {len(paths)} paths from '{bucket_id}' failed: {error}",
+                completed=removed,
+                failed=failed,
+            ) from error
+        return removed
 
     def list_objects(
         self,
@@ -318,6 +468,10 @@ class SupabaseConnection(BaseConnection[Client]):
     ) -> "list[dict[str, str]]":
         """Lists all the objects within a bucket.
 
+        If Supabase cannot be reached (an `httpx.TransportError`), the last result fetched for the
+        same arguments is returned instead, so it may be stale. A warning is logged when this
+        happens. The error is raised if there is no earlier result.
+
         Parameters
         ----------
         bucket_id : str
@@ -336,9 +490,9 @@ class SupabaseConnection(BaseConnection[Client]):
             The maximum time to keep an entry in the cache. Defaults to `None` (cache never expires).
         """
 
-        @cache_data(ttl=ttl)
-        def _list_objects(_self, bucket_id, path, limit, offset, sortby, order):
-            return _self.client.storage.from_(bucket_id).list(
+        @cache_data(ttl=ttl, hash_funcs={SupabaseConnection: id})
+        def _list_objects(conn, bucket_id, path, limit, offset, sortby, order):
+            return conn._bucket(bucket_id).list(
                 path,
                 dict(
                     limit=limit,
@@ -347,13 +501,14 @@ class SupabaseConnection(BaseConnection[Client]):
                 ),
             )
 
-        return _list_objects(self, bucket_id, path, limit, offset, sortby, order)
+        return self._read_or_last(_list_objects, bucket_id, path, limit, offset, sortby, order)
 
     def create_signed_urls(
         self,
         bucket_id: str,
         paths: "list[str]",
         expires_in: int,
+        ttl: Optional[Union[float, timedelta, str]] = None,
     ) -> "list[dict[str, str]]":
         """Parameters
         ----------
@@ -363,21 +518,49 @@ class SupabaseConnection(BaseConnection[Client]):
             File paths to be downloaded, including the current file name.
         expires_in : int
             Number of seconds until the signed URL expires.
+        ttl : float, timedelta, str, or None
+            The maximum time to reuse signed URLs from the cache. URLs are never reused within a
+            minute of expiring, and results containing unsigned paths are not cached. Defaults to
+            `None` (URLs are signed on every call).
         """
-        json = {"paths": paths, "expiresIn": str(expires_in)}
 
-        response = self.client.storage._request(
-            "POST",
-            f"/object/sign/{bucket_id}",
-            json=json,
-        )
-        data = response.json()
-        for item in data:
-            if item["signedURL"]:
-                item["signedURL"] = (
-                    f"{self.client.storage._client.base_url}{item['signedURL'].lstrip('/')}"
-                )
+        def _sign(conn, bucket_id, paths, expires_in):
+            json = {"paths": paths, "expiresIn": str(expires_in)}
 
+            response = conn._storage_request(
+                "POST",
+                f"/object/sign/{bucket_id}",
+                json=json,
+            )
+            data = response.json()
+            base_url = str(conn.client.storage._client.base_url)
+            for item in data:
+                signed_url = item["signedURL"]
+                if signed_url:
+                    if signed_url[0] == "/":
+                        signed_url = signed_url[1:]
+                    item["signedURL"] = base_url + signed_url
+
+            return data
+
+        if ttl is None or expires_in <= _SIGNED_URL_MARGIN:
+            return _sign(self, bucket_id, paths, expires_in)
+        reuse_for = min(time_to_seconds(ttl), expires_in - _SIGNED_URL_MARGIN)
+
+        # The cache's own ttl stays fixed, since changing it per call would recreate the cache and
+        # drop the entries of other lifetimes. Each entry carries its own expiry instead.
+        @cache_data(max_entries=_SIGNED_URLS_MAX_ENTRIES, hash_funcs={SupabaseConnection: id})
+        def _create_signed_urls(conn, bucket_id, paths, expires_in, reuse_for):
+            return _sign(conn, bucket_id, paths, expires_in), time.time() + reuse_for
+
+        key = (self, bucket_id, paths, expires_in, reuse_for)
+        data, reuse_until = _create_signed_urls(*key)
+        if time.time() >= reuse_until:
+            _create_signed_urls.clear(*key)
+            data, _ = _create_signed_urls(*key)
+        # Paths that could not be signed, e.g. files not uploaded yet, are retried on the next call
+        if any(item.get("error") or not item.get("signedURL") for item in data):
+            _create_signed_urls.clear(*key)
         return data
 
     def get_public_url(
@@ -396,9 +579,9 @@ class SupabaseConnection(BaseConnection[Client]):
             The maximum time to keep an entry in the cache. Defaults to `None` (cache never expires).
         """
 
-        @cache_data(ttl)
-        def _get_public_url(_self, bucket_id, filepath):
-            return _self.client.storage.from_(bucket_id).get_public_url(filepath)
+        @cache_data(ttl=ttl, hash_funcs={SupabaseConnection: id})
+        def _get_public_url(conn, bucket_id, filepath):
+            return conn._bucket(bucket_id).get_public_url(filepath)
 
         return _get_public_url(self, bucket_id, filepath)
 
@@ -412,21 +595,17 @@ class SupabaseConnection(BaseConnection[Client]):
         """
         from storage3.utils import StorageException
 
-        _path = self.client.storage.from_(bucket_id)._get_final_path(path)
-        response = self.client.storage.from_(bucket_id)._request(
-            "POST", f"/object/upload/sign/{_path}"
-        )
+        _path = self._bucket(bucket_id)._get_final_path(path)
+        response = self._bucket(bucket_id)._request("POST", f"/object/upload/sign/{_path}")
         data = response.json()
-        full_url: urllib.parse.ParseResult = urllib.parse.urlparse(
-            str(self.client.storage._client.base_url) + data["url"]
-        )
-        query_params = urllib.parse.parse_qs(full_url.query)
+        # Only the token needs to be read back, from the query string of the returned path
+        query_params = dict(urllib.parse.parse_qsl(data["url"].partition("?")[2]))
 
         if not query_params.get("token"):
             raise StorageException("No token sent by the API")
         return {
-            "signed_url": full_url.geturl(),
-            "token": query_params["token"][0],
+            "signed_url": str(self.client.storage._client.base_url) + data["url"],
+            "token": query_params["token"],
             "path": path,
         }
 
@@ -455,24 +634,22 @@ class SupabaseConnection(BaseConnection[Client]):
             File to upload. This can be a path of the file if `source="hosted"`,
             or the `BytesIO` object returned by `st.file_uploader()` if `source="local"`.
         """
-        _path = self.client.storage.from_(bucket_id)._get_final_path(path)
-        _url = urllib.parse.urlparse(f"/object/upload/sign/{_path}")
-        query_params = urllib.parse.urlencode({"token": token})
-        final_url = f"{_url.geturl()}?{query_params}"
+        _path = self._bucket(bucket_id)._get_final_path(path)
+        final_url = f"/object/upload/sign/{_path}?{urllib.parse.urlencode({'token': token})}"
 
-        filename = path.rsplit("/", maxsplit=1)[-1]
+        filename = path.rpartition("/")[2]
 
         if source == "local":
             _file = {"file": (filename, file, file.type)}
-            response = self.client.storage.from_(bucket_id)._request(
+            response = self._bucket(bucket_id)._request(
                 "PUT",
                 final_url,
                 files=_file,
             )
         elif source == "hosted":
             with open(file, "rb") as f_obj:
-                _file = {"file": (filename, f_obj, mimetypes.guess_type(file)[0])}
-                response = self.client.storage.from_(bucket_id)._request(
+                _file = {"file": (filename, f_obj, _guess_mime(file))}
+                response = self._bucket(bucket_id)._request(
                     "PUT",
                     final_url,
                     files=_file,
@@ -480,6 +657,52 @@ class SupabaseConnection(BaseConnection[Client]):
 
         return response.json()
 
+    def insert_many(
+        self,
+        table_name: str,
+        rows: Iterable[dict],
+        chunk_size: int = 500,
+    ) -> "list[dict]":
+        """Inserts rows in batches, sending one request per `chunk_size` rows instead of one per row.
+
+        Batches are inserted one after another and are not atomic: if a batch fails, the batches
+        before it stay inserted. A `BatchError` is raised in that case, chained to the original
+        error. Its `completed` attribute holds the rows inserted so far and `failed` the rows of
+        the batch that failed, so the insert can be resumed. Later batches are not attempted.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table to insert the rows into.
+        rows : Iterable[dict]
+            Rows to insert. Any iterable works, including generators.
+        chunk_size : int
+            Maximum number of rows sent in a single request. Defaults to 500.
+
+        Returns
+        -------
+        list[dict]
+            The inserted rows, as returned by the API.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        inserted = []
+        sent = 0
+        rows = iter(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            try:
+                response = self.client.table(table_name).insert(chunk).execute()
+            except Exception as e:
+                raise BatchError(
+                    f"Inserting into '{table_name}' failed after {sent} rows were inserted: {e}",
+                    completed=inserted,
+                    failed=chunk,
+                ) from e
+            inserted.extend(response.data)
+            sent += len(chunk)
+        return inserted
+
 
 def execute_query(
     query: Union[SyncSelectRequestBuilder, SyncQueryRequestBuilder, SyncFilterRequestBuilder],
@@ -502,7 +725,7 @@ def execute_query(
     def _hash_func(x):
         return hash(x.path + str(x.params))
 
-    @cache_resource(
+    @cache_data(
         ttl=ttl,
         hash_funcs={
             SyncSelectRequestBuilder: _hash_func,
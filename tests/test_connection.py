@@ -0,0 +1,243 @@
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import streamlit as st
+
+import st_supabase_connection
+from st_supabase_connection import BatchError, SupabaseConnection
+
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class StubStorageRequest:
+    """Stands in for storage3's `_request`, recording every call."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def __call__(self, method, path, json=None):
+        self.calls.append((method, path, json))
+        return StubResponse(self.handler(method, path, json))
+
+
+def _connection(storage_request=None, client=None):
+    """Builds a connection without connecting, wired to stubs instead of Supabase."""
+    conn = SupabaseConnection.__new__(SupabaseConnection)
+    conn.client = client
+    conn._storage_request = storage_request
+    conn._buckets = {}
+    conn._last_results = OrderedDict()
+    conn._last_results_lock = threading.Lock()
+    return conn
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    st.cache_data.clear()
+    yield
+    st.cache_data.clear()
+
+
+def _sign_handler(method, path, json):
+    return [
+        {"path": p, "signedURL": f"/object/sign/{p}?token=t", "error": None} for p in json["paths"]
+    ]
+
+
+def _signing_connection(handler=_sign_handler):
+    storage = SimpleNamespace(_client=SimpleNamespace(base_url="https://x.supabase.co/storage/v1/"))
+    return _connection(StubStorageRequest(handler), SimpleNamespace(storage=storage))
+
+
+def test_create_signed_urls_without_ttl_signs_every_call():
+    conn = _signing_connection()
+
+    first = conn.create_signed_urls("bucket", ["a.png"], expires_in=3600)
+    conn.create_signed_urls("bucket", ["a.png"], expires_in=3600)
+
+    assert first[0]["signedURL"] == "https://x.supabase.co/storage/v1/object/sign/a.png?token=t"
+    assert len(conn._storage_request.calls) == 2
+
+
+def test_create_signed_urls_with_ttl_reuses_urls():
+    conn = _signing_connection()
+
+    first = conn.create_signed_urls("bucket", ["a.png"], expires_in=3600, ttl=600)
+    second = conn.create_signed_urls("bucket", ["a.png"], expires_in=3600, ttl=600)
+
+    assert first == second
+    assert len(conn._storage_request.calls) == 1
+
+
+def test_create_signed_urls_refreshes_stale_entries(monkeypatch):
+    conn = _signing_connection()
+    now = 1_000_000.0
+    monkeypatch.setattr(st_supabase_connection.time, "time", lambda: now)
+
+    conn.create_signed_urls("bucket", ["a.png"], expires_in=3600, ttl=600)
+    now += 601
+    conn.create_signed_urls("bucket", ["a.png"], expires_in=3600, ttl=600)
+    conn.create_signed_urls("bucket", ["a.png"], expires_in=3600, ttl=600)
+
+    assert len(conn._storage_request.calls) == 2
+
+
+def test_create_signed_urls_does_not_reuse_past_expiry_margin(monkeypatch):
+    conn = _signing_connection()
+    now = 1_000_000.0
+    monkeypatch.setattr(st_supabase_connection.time, "time", lambda: now)
+
+    conn.create_signed_urls("bucket", ["a.png"], expires_in=120, ttl=3600)
+    now += 61
+    conn.create_signed_urls("bucket", ["a.png"], expires_in=120, ttl=3600)
+
+    assert len(conn._storage_request.calls) == 2
+
+
+def test_create_signed_urls_does_not_cache_errors():
+    def handler(method, path, json):
+        return [
+            {"path": p, "signedURL": None, "error": "Either the object does not exist"}
+            for p in json["paths"]
+        ]
+
+    conn = _signing_connection(handler)
+
+    conn.create_signed_urls("bucket", ["missing.png"], expires_in=3600, ttl=600)
+    conn.create_signed_urls("bucket", ["missing.png"], expires_in=3600, ttl=600)
+
+    assert len(conn._storage_request.calls) == 2
+
+
+def test_read_or_last_serves_last_result_when_unreachable():
+    conn = _connection()
+    results = iter([["first"], httpx.ConnectError("down")])
+
+    def fetch(conn, *args):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert conn._read_or_last(fetch, "bucket") == ["first"]
+    assert conn._read_or_last(fetch, "bucket") == ["first"]
+
+
+def test_read_or_last_raises_without_last_result():
+    conn = _connection()
+
+    def fetch(conn, *args):
+        raise httpx.ConnectError("down")
+
+    with pytest.raises(httpx.ConnectError):
+        conn._read_or_last(fetch, "bucket")
+
+
+def test_read_or_last_keeps_most_recently_used_results(monkeypatch):
+    monkeypatch.setattr(st_supabase_connection, "_LAST_RESULTS_MAX_ENTRIES", 2)
+    conn = _connection()
+
+    def fetch(conn, *args):
+        return args
+
+    for bucket_id in ("a", "b", "c"):
+        conn._read_or_last(fetch, bucket_id)
+
+    assert list(conn._last_results) == [("fetch", "b"), ("fetch", "c")]
+
+
+def test_download_is_cached():
+    downloads = []
+
+    def download(path):
+        downloads.append(path)
+        return b"data"
+
+    conn = _connection()
+    conn._buckets["bucket"] = SimpleNamespace(download=download)
+
+    file_name, mime, data = conn.download("bucket", "folder/a.txt")
+    conn.download("bucket", "folder/a.txt")
+
+    assert (file_name, mime, data.read()) == ("a.txt", "text/plain", b"data")
+    assert downloads == ["folder/a.txt"]
+
+
+def _remove_handler(method, path, json):
+    if "fail" in json["prefixes"]:
+        raise httpx.ConnectError("down")
+    return [{"name": p} for p in json["prefixes"]]
+
+
+def test_remove_sends_paths_in_chunks():
+    conn = _connection(StubStorageRequest(_remove_handler))
+    paths = [f"f{i}" for i in range(5)]
+
+    removed = conn.remove("bucket", paths, chunk_size=2)
+
+    assert sorted(item["name"] for item in removed) == paths
+    assert sorted(len(json["prefixes"]) for _, _, json in conn._storage_request.calls) == [1, 2, 2]
+
+
+def test_remove_reports_deleted_and_failed_paths():
+    conn = _connection(StubStorageRequest(_remove_handler))
+
+    with pytest.raises(BatchError) as exc_info:
+        conn.remove("bucket", ["a", "b", "fail", "c"], chunk_size=2)
+
+    assert [item["name"] for item in exc_info.value.completed] == ["a", "b"]
+    assert exc_info.value.failed == ["fail", "c"]
+    assert isinstance(exc_info.value.__cause__, httpx.ConnectError)
+
+
+def test_remove_rejects_empty_chunks():
+    with pytest.raises(ValueError):
+        _connection().remove("bucket", ["a"], chunk_size=0)
+
+
+class StubTable:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.batches = []
+
+    def insert(self, rows):
+        self.batches.append(rows)
+        return self
+
+    def execute(self):
+        if len(self.batches) == self.fail_on:
+            raise httpx.ConnectError("down")
+        return StubResponse(self.batches[-1])
+
+
+def test_insert_many_sends_rows_in_chunks():
+    table = StubTable()
+    conn = _connection(client=SimpleNamespace(table=lambda name: table))
+    rows = ({"id": i} for i in range(5))
+
+    inserted = conn.insert_many("countries", rows, chunk_size=2)
+
+    assert inserted == [{"id": i} for i in range(5)]
+    assert [len(batch) for batch in table.batches] == [2, 2, 1]
+
+
+def test_insert_many_reports_inserted_rows_on_failure():
+    table = StubTable(fail_on=2)
+    conn = _connection(client=SimpleNamespace(table=lambda name: table))
+
+    with pytest.raises(BatchError, match="after 2 rows") as exc_info:
+        conn.insert_many("countries", [{"id": i} for i in range(5)], chunk_size=2)
+
+    assert exc_info.value.completed == [{"id": 0}, {"id": 1}]
+    assert exc_info.value.failed == [{"id": 2}, {"id": 3}]
+    assert len(table.batches) == 2